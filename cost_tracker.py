@@ -4,45 +4,162 @@ Cost tracking utilities for JGL Assistant.
 Tracks API costs across all operations for each actor project.
 """
 
-import json
+import atexit
+import hashlib
 import os
-from datetime import datetime
-from typing import Dict, Any, Optional
+import queue
+import threading
+import time
+import weakref
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import logging
 
+from json_utils import dumps as _dumps, loads as _loads
+
 logger = logging.getLogger(__name__)
 
+# Writer queue control markers
+_SAVE_SUMMARY = object()
+_STOP = object()
+
+
+def _close_at_exit(tracker_ref: "weakref.ReferenceType[CostTracker]") -> None:
+    """Exit hook; holds the tracker weakly so finished trackers can be collected."""
+    tracker = tracker_ref()
+    if tracker is not None:
+        tracker.close()
+
+
+@dataclass
+class CostEntry:
+    """A single tracked API operation."""
+    
+    __slots__ = ("ts", "step", "model", "cost", "usage", "additional_info")
+    
+    ts: float
+    step: str
+    model: str
+    cost: float
+    usage: Dict[str, Any]
+    additional_info: Dict[str, Any]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dictionary form written to the JSONL log."""
+        return {
+            "ts": self.ts,
+            "step": self.step,
+            "model": self.model,
+            "cost": self.cost,
+            "usage": self.usage,
+            "additional_info": self.additional_info
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CostEntry":
+        """Build an entry from its logged form, accepting older ISO timestamps."""
+        ts = data.get("ts")
+        if ts is None:
+            from datetime import datetime
+            ts = datetime.fromisoformat(data["timestamp"]).timestamp()
+        return cls(
+            ts=ts,
+            step=data["step"],
+            model=data["model"],
+            cost=data["cost"],
+            usage=data.get("usage") or {},
+            additional_info=data.get("additional_info") or {}
+        )
+
 
 class CostTracker:
     """
     Tracks and persists API costs for actor projects.
+    
+    Entries are appended one per line to a JSONL log next to the cost
+    tracking JSON file, which only holds the small project summary.
+    Disk writes happen on a background thread so add_entry never blocks
+    on I/O; call flush() or close() when the data must be on disk.
     """
     
-    def __init__(self, cost_file_path: str):
+    def __init__(self, cost_file_path: str, flush_every: int = 8, flush_interval: float = 5.0):
         """
         Initialize the cost tracker.
         
         Args:
             cost_file_path: Path to the cost tracking JSON file
+            flush_every: Write queued entries once this many are pending
+            flush_interval: Write queued entries at most this many seconds after the first
         """
         self.cost_file_path = cost_file_path
-        self.cost_data = self._load_existing_data()
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.entries_file_path = os.path.splitext(cost_file_path)[0] + '.jsonl'
+        self._last_saved_digest: Optional[bytes] = None
+        self.cost_data, saved_steps = self._load_existing_data()
+        
+        # Per-step totals, kept up to date by add_entry. The summary saved in the
+        # header is reused when it accounts for every logged entry
+        entries = self.cost_data["entries"]
+        self._step_summary = (self._restore_step_summary(saved_steps, len(entries))
+                              or self._build_step_summary(entries))
+        
+        # Guards cost_data totals and the step summary across threads
+        self._lock = threading.RLock()
+        # Each writer thread drains its own queue, so a writer that is shutting down
+        # never takes work (or the stop marker) meant for its replacement
+        self._queue: Optional["queue.SimpleQueue[Any]"] = None
+        self._writer: Optional[threading.Thread] = None
+        # Orders file writes when a closing writer overlaps a new one
+        self._io_lock = threading.Lock()
+        atexit.register(_close_at_exit, weakref.ref(self))
+    
+    def __enter__(self) -> "CostTracker":
+        return self
     
-    def _load_existing_data(self) -> Dict[str, Any]:
-        """Load existing cost data if file exists."""
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+    
+    def _load_existing_data(self) -> Tuple[Dict[str, Any], Any]:
+        """Load existing cost data if files exist, along with the saved step summary."""
+        header = {}
         if os.path.exists(self.cost_file_path):
             try:
-                with open(self.cost_file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.cost_file_path, 'rb') as f:
+                    header = _loads(f.read())
             except Exception as e:
                 logger.warning(f"Could not load existing cost data: {e}")
         
-        # Initialize with empty structure
-        return {
-            "actor_name": "",
+        data = {
+            "actor_name": header.get("actor_name", ""),
             "total_cost": 0.0,
             "entries": []
         }
+        
+        if os.path.exists(self.entries_file_path):
+            data["entries"] = list(self._iter_entries())
+        elif header.get("entries"):
+            # Older tracking files kept every entry inline; move them to the log
+            data["entries"] = [CostEntry.from_dict(entry) for entry in header["entries"]]
+            self._append_entries(data["entries"])
+        
+        data["total_cost"] = sum(entry.cost for entry in data["entries"])
+        return data, header.get("steps")
+    
+    def _iter_entries(self) -> Iterator[CostEntry]:
+        """Stream entries from the JSONL log, skipping unreadable lines."""
+        try:
+            with open(self.entries_file_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield CostEntry.from_dict(_loads(line))
+                    except (ValueError, KeyError) as e:
+                        logger.warning(f"Skipping unreadable cost entry: {e}")
+        except OSError as e:
+            logger.warning(f"Could not read cost entries: {e}")
     
     def add_entry(self, 
                   step: str, 
@@ -60,36 +177,221 @@ class CostTracker:
             usage_data: Optional token usage data
             additional_info: Any additional information to track
         """
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "step": step,
-            "model": model,
-            "cost": cost,
-            "usage": usage_data or {},
-            "additional_info": additional_info or {}
-        }
+        entry = CostEntry(
+            ts=time.time(),
+            step=step,
+            model=model,
+            cost=cost,
+            usage=usage_data or {},
+            additional_info=additional_info or {}
+        )
         
-        self.cost_data["entries"].append(entry)
-        self.cost_data["total_cost"] += cost
+        with self._lock:
+            self.cost_data["entries"].append(entry)
+            self.cost_data["total_cost"] += cost
+            self._record_step(step, model, cost)
         
-        # Save immediately
-        self._save_data()
+        # Hand the entry to the writer thread; the log is appended in batches
+        self._enqueue(entry)
         
         logger.info(f"Tracked cost: {step} - ${cost:.4f} ({model})")
     
     def set_actor_name(self, actor_name: str) -> None:
         """Set the actor name for this tracking file."""
-        self.cost_data["actor_name"] = actor_name
-        self._save_data()
+        with self._lock:
+            self.cost_data["actor_name"] = actor_name
+        self._enqueue(_SAVE_SUMMARY)
+    
+    def flush(self) -> None:
+        """Block until all queued entries and the summary are written to disk."""
+        done = threading.Event()
+        with self._lock:
+            if self._queue is None:
+                return
+            self._queue.put(done)
+        done.wait()
+    
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        # Items queued after this go to a fresh writer with its own queue
+        with self._lock:
+            writer, work_queue = self._writer, self._queue
+            if writer is None or work_queue is None:
+                return
+            work_queue.put(_STOP)
+            self._writer = None
+            self._queue = None
+        writer.join()
+    
+    def _enqueue(self, item: Any) -> None:
+        """Queue an item for the writer thread, starting it if needed."""
+        # Under the lock so concurrent callers can't each start a writer
+        with self._lock:
+            if self._writer is None or self._queue is None:
+                self._queue = queue.SimpleQueue()
+                self._writer = threading.Thread(target=self._writer_loop, args=(self._queue,),
+                                                name="CostTrackerWriter", daemon=True)
+                self._writer.start()
+            self._queue.put(item)
+    
+    def _writer_loop(self, work_queue: "queue.SimpleQueue[Any]") -> None:
+        """Drain this writer's queue, coalescing entries into batched appends."""
+        while True:
+            item = work_queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            batch: List[CostEntry] = []
+            waiters: List[threading.Event] = []
+            save_summary = False
+            stop = False
+            
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                if item is _SAVE_SUMMARY:
+                    save_summary = True
+                else:
+                    batch.append(item)
+                    if len(batch) >= self.flush_every:
+                        break
+                
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = work_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            
+            with self._io_lock:
+                if batch:
+                    self._append_entries(batch)
+                if batch or save_summary or waiters or stop:
+                    self._save_data()
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+    
+    def _append_entries(self, entries: List[CostEntry]) -> None:
+        """Append entries to the JSONL log in a single write."""
+        try:
+            with open(self.entries_file_path, 'ab') as f:
+                f.write(b''.join(_dumps(entry.to_dict()) + b'\n' for entry in entries))
+        except Exception as e:
+            logger.error(f"Failed to append cost entries: {e}")
     
     def _save_data(self) -> None:
-        """Save cost data to file."""
+        """Save the cost summary (actor name and total) to file."""
+        with self._lock:
+            summary = {
+                "actor_name": self.cost_data["actor_name"],
+                "total_cost": self.cost_data["total_cost"],
+                "steps": self.get_step_summary(),
+                "entries_file": os.path.basename(self.entries_file_path)
+            }
+        buf = _dumps(summary) + b'\n'
+        
+        # Skip the write when nothing changed since the last save
+        digest = hashlib.blake2b(buf, digest_size=16).digest()
+        if digest == self._last_saved_digest:
+            return
+        
+        # Write to a temp file and swap it in so a crash never leaves a torn file
+        tmp_path = self.cost_file_path + '.tmp'
         try:
-            with open(self.cost_file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.cost_data, f, indent=2)
+            with open(tmp_path, 'wb') as f:
+                f.write(buf)
+            os.replace(tmp_path, self.cost_file_path)
+            self._last_saved_digest = digest
         except Exception as e:
             logger.error(f"Failed to save cost tracking data: {e}")
     
+    def dump_pretty(self, out_path: str) -> None:
+        """
+        Write an indented copy of the summary and all entries for human inspection.
+        
+        Args:
+            out_path: Where to write the pretty-printed JSON
+        """
+        with self._lock:
+            data = {
+                "actor_name": self.cost_data["actor_name"],
+                "total_cost": self.cost_data["total_cost"],
+                "steps": self.get_step_summary(),
+                "entries": [entry.to_dict() for entry in self.cost_data["entries"]]
+            }
+        with open(out_path, 'wb') as f:
+            f.write(_dumps(data, indent=True) + b'\n')
+    
+    @staticmethod
+    def _build_step_summary(entries: List[CostEntry]) -> Dict[str, Dict[str, Any]]:
+        """Aggregate loaded entries into the per-step summary in one pass."""
+        counts: Counter = Counter()
+        totals: Dict[str, float] = defaultdict(float)
+        models: Dict[str, set] = defaultdict(set)
+        for entry in entries:
+            counts[entry.step] += 1
+            totals[entry.step] += entry.cost
+            models[entry.step].add(entry.model)
+        
+        return {
+            step: {
+                "count": count,
+                "total_cost": totals[step],
+                "models_used": models[step]
+            }
+            for step, count in counts.items()
+        }
+    
+    @staticmethod
+    def _restore_step_summary(saved_steps: Any, entry_count: int) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Rebuild the per-step summary from the copy saved in the header.
+        
+        Args:
+            saved_steps: The header's "steps" field, as written by _save_data
+            entry_count: Number of entries loaded from the log
+            
+        Returns:
+            The summary, or None if it is missing, malformed or out of step with the log
+        """
+        if not entry_count or not isinstance(saved_steps, dict):
+            return None
+        try:
+            summary = {
+                step: {
+                    "count": int(data["count"]),
+                    "total_cost": float(data["total_cost"]),
+                    "models_used": set(data["models_used"])
+                }
+                for step, data in saved_steps.items()
+            }
+        except (KeyError, TypeError, ValueError):
+            return None
+        
+        # A crash between appending entries and rewriting the header leaves a stale copy
+        if sum(data["count"] for data in summary.values()) != entry_count:
+            return None
+        return summary
+    
+    def _record_step(self, step: str, model: str, cost: float) -> None:
+        """Fold a single entry into the running per-step summary."""
+        step_data = self._step_summary.get(step)
+        if step_data is None:
+            step_data = self._step_summary[step] = {
+                "count": 0,
+                "total_cost": 0.0,
+                "models_used": set()
+            }
+        
+        step_data["count"] += 1
+        step_data["total_cost"] += cost
+        step_data["models_used"].add(model)
+    
     def get_step_summary(self) -> Dict[str, Dict[str, Any]]:
         """
         Get summary of costs by step.
@@ -97,34 +399,38 @@ class CostTracker:
         Returns:
             Dictionary with step names as keys and summary data as values
         """
-        summary = {}
-        
-        for entry in self.cost_data["entries"]:
-            step = entry["step"]
-            if step not in summary:
-                summary[step] = {
-                    "count": 0,
-                    "total_cost": 0.0,
-                    "models_used": set()
+        # Copy, converting sets to lists for JSON serialization
+        with self._lock:
+            return {
+                step: {
+                    "count": data["count"],
+                    "total_cost": data["total_cost"],
+                    "models_used": list(data["models_used"])
                 }
-            
-            summary[step]["count"] += 1
-            summary[step]["total_cost"] += entry["cost"]
-            summary[step]["models_used"].add(entry["model"])
-        
-        # Convert sets to lists for JSON serialization
-        for step_data in summary.values():
-            step_data["models_used"] = list(step_data["models_used"])
-        
-        return summary
+                for step, data in self._step_summary.items()
+            }
     
     def get_total_cost(self) -> float:
         """Get total cost for this actor."""
         return self.cost_data["total_cost"]
     
-    def get_latest_entries(self, n: int = 5) -> list:
+    def get_entry_count(self) -> int:
+        """Get the number of tracked operations."""
+        return len(self.cost_data["entries"])
+    
+    def get_latest_entries(self, n: int = 5) -> List[CostEntry]:
         """Get the n most recent cost entries."""
-        return self.cost_data["entries"][-n:] if self.cost_data["entries"] else []
+        if n <= 0:
+            return []
+        with self._lock:
+            entries = self.cost_data["entries"]
+            return entries[-n:] if n < len(entries) else list(entries)
+
+
+def format_entry_timestamp(entry: CostEntry) -> str:
+    """Format an entry's epoch timestamp for display."""
+    from datetime import datetime
+    return datetime.fromtimestamp(entry.ts).isoformat(timespec='seconds')
 
 
 def format_cost_summary(cost_tracker: CostTracker) -> str:
@@ -142,13 +448,24 @@ def format_cost_summary(cost_tracker: CostTracker) -> str:
     
     lines = [
         f"Total Cost: ${total:.4f}",
-        f"Operations: {len(cost_tracker.cost_data['entries'])}",
+        f"Operations: {cost_tracker.get_entry_count()}",
         ""
     ]
     
     if summary:
         lines.append("Cost by Step:")
-        for step, data in summary.items():
-            lines.append(f"  - {step}: ${data['total_cost']:.4f} ({data['count']} times)")
+        lines.extend(
+            f"  - {step}: ${data['total_cost']:.4f} ({data['count']} times)"
+            for step, data in summary.items()
+        )
+    
+    latest = cost_tracker.get_latest_entries(3)
+    if latest:
+        lines.append("")
+        lines.append("Latest Operations:")
+        lines.extend(
+            f"  - {format_entry_timestamp(entry)} {entry.step}: ${entry.cost:.4f} ({entry.model})"
+            for entry in reversed(latest)
+        )
     
     return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Shared script prompt for the dev experiments.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+# Static rules and output format. Everything that is the same for every actor
+# comes first so repeated requests share a cacheable prompt prefix; the actor
+# name is only appended at the very end.
+SCRIPT_PROMPT_PREFIX = """You are writing a 5-minute biography video for the SUBJECT named at the end of this request.
+
+GLOBAL RULES  
+• 780–830 words (≈5 min @ 155 wpm).  
+• Action beats in historical-present; context may use past but never mix tenses in one sentence.  
+• Voice = confident "sports-doc storyteller": punchy, nostalgic, dry-witty; no Gen-Z slang.  
+• ≥ 8 explicit year stamps inside the narration; mention the actor's age at least twice.  
+• Around the 80–90-second mark, drop a short tension-raising **question**—ask it plainly; never label it.  
+• Weave one humorous callback in each later act.  
+• **Output only the words the narrator speaks**—no outros, CTAs, visuals, music cues, section headers, timelines, or tables.
+
+OUTPUT MARKDOWN FORMAT (exactly, with [SUBJECT] replaced by the subject's name):  
+
+**[SUBJECT] — 5-MINUTE BIO SCRIPT (~XXX words)**  
+
+**HOOK**  
+Fragment. Fragment. Fragment. And [surprise facet].  
+[SUBJECT]'s [metaphor or superlative tied to a signature role]. **[Imperative callback, 2–4 words—verb-first, no pronouns], and let's get rollin'.**
+
+**BIO**  
+(Full narration here in continuous paragraphs—birth to present-day epilogue. No additional headings.)
+"""
+
+# Per-actor tail
+SCRIPT_PROMPT_SUFFIX = "\nSUBJECT: {actor_name}\n"
+
+
+@lru_cache(maxsize=256)
+def build_prompt(actor_name: str) -> str:
+    """Build the script prompt for an actor: shared static prefix, then the name."""
+    return SCRIPT_PROMPT_PREFIX + SCRIPT_PROMPT_SUFFIX.format(actor_name=actor_name)
+
+
+# Opens each script when several actors are requested at once, followed by the
+# header naming the subject the script belongs to
+SCRIPT_DELIMITER = "<<<NEXT_SCRIPT>>>"
+SCRIPT_HEADER = "SUBJECT:"
+
+_BATCH_HEADER_RE = re.compile(
+    rf"^[ \t]*{re.escape(SCRIPT_DELIMITER)}[ \t]*{re.escape(SCRIPT_HEADER)}[ \t]*(.+?)[ \t]*$", re.MULTILINE
+)
+
+
+def build_batch_prompt(actor_names: List[str]) -> str:
+    """Build one prompt asking for a script per actor, sharing the static prefix."""
+    subjects = "\n".join(f"{i}. {name}" for i, name in enumerate(actor_names, 1))
+    return (
+        f"{SCRIPT_PROMPT_PREFIX}\n"
+        f"Write one script per SUBJECT below, in this order, each in the exact OUTPUT MARKDOWN FORMAT. "
+        f"Start every script with a line containing only {SCRIPT_DELIMITER} {SCRIPT_HEADER} "
+        f"followed by the subject's name exactly as listed.\n\n"
+        f"SUBJECTS:\n{subjects}\n"
+    )
+
+
+def _subject_key(name: str) -> str:
+    """Compare subject names ignoring case, spacing and a copied list number."""
+    return " ".join(re.sub(r"^\d+\.\s*", "", name).lower().split())
+
+
+def split_batch_output(output: str, actor_names: List[str]) -> Dict[str, str]:
+    """
+    Map each requested actor to their script in a batch response.
+    
+    Sections are matched by their header, not their position, so a dropped or
+    merged section never shifts the remaining scripts onto the wrong actor.
+    Actors without a labelled, non-empty section are left out.
+    """
+    wanted = {_subject_key(name): name for name in actor_names}
+    headers = list(_BATCH_HEADER_RE.finditer(output))
+    
+    scripts: Dict[str, str] = {}
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(output)
+        actor_name = wanted.get(_subject_key(header.group(1)))
+        script = output[header.end():end].strip()
+        if actor_name and script and actor_name not in scripts:
+            scripts[actor_name] = script
+    return scripts
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""
+Imperative callback checks shared by the signature-callback test and batch QA.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+# Bold imperative callback that closes the hook, e.g. "**Spin the rotor, and let's get rollin'.**"
+CALLBACK_RE = re.compile(r"\*\*([^*]+), and let's get rollin'\.\*\*")
+
+# Callbacks must be pronoun-free
+PRONOUNS = frozenset({
+    'i', 'me', 'my', 'mine', 'we', 'us', 'our', 'ours', 'you', 'your', 'yours',
+    'he', 'him', 'his', 'she', 'her', 'hers', 'it', 'its', 'they', 'them', 'their', 'theirs'
+})
+
+
+def validate_callback(hook_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract and check the imperative callback in a HOOK section.
+    
+    Args:
+        hook_text: The HOOK section of a generated script
+        
+    Returns:
+        Dictionary with the callback, its word count, whether it meets the
+        2-4 word rule, its first word and any pronouns found, or None if
+        the hook has no callback
+    """
+    match = CALLBACK_RE.search(hook_text)
+    if not match:
+        return None
+    
+    callback = match.group(1)
+    words = callback.casefold().split()
+    return {
+        "callback": callback,
+        "word_count": len(words),
+        "meets_length": 2 <= len(words) <= 4,
+        "first_word": words[0] if words else "",
+        "pronouns": [w for w in words if w in PRONOUNS]
+    }
\ No newline at end of file
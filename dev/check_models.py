@@ -1,30 +1,53 @@
-from openai import OpenAI
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import TYPE_CHECKING
 import os
+import re
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    from openai import OpenAI
 
-# Initialize client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Model families worth listing
+RELEVANT_MODEL_RE = re.compile(r'gpt|o3|o1', re.IGNORECASE)
 
-print("Checking available models...")
-print("=" * 60)
 
-try:
-    models = client.models.list()
+@lru_cache(maxsize=1)
+def get_client() -> "OpenAI":
+    """Shared client with a keep-alive connection pool."""
+    import httpx
+    from openai import OpenAI
     
-    # Filter for relevant models
-    relevant_models = []
-    for model in models:
-        if any(keyword in model.id.lower() for keyword in ['gpt', 'o3', 'o1']):
-            relevant_models.append(model.id)
+    return OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=8))
+    )
+
+
+@lru_cache(maxsize=1)
+def list_model_ids() -> tuple:
+    """List available model ids once per process."""
+    return tuple(model.id for model in get_client().models.list())
+
+
+def main():
+    from dotenv import load_dotenv
     
-    # Sort and display
-    relevant_models.sort()
-    print(f"Found {len(relevant_models)} relevant models:")
-    for model in relevant_models:
-        print(f"  - {model}")
+    # Load environment variables
+    load_dotenv()
+    
+    print("Checking available models...")
+    print("=" * 60)
+    
+    try:
+        # Filter for relevant models and sort in one pass
+        relevant_models = sorted(m for m in list_model_ids() if RELEVANT_MODEL_RE.search(m))
         
-except Exception as e:
-    print(f"Error: {e}")
\ No newline at end of file
+        print(f"Found {len(relevant_models)} relevant models:")
+        for model in relevant_models:
+            print(f"  - {model}")
+            
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
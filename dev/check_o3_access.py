@@ -1,13 +1,7 @@
-import os
-from agents import Agent, Runner
-from dotenv import load_dotenv
-import time
-
-# Load environment variables
-load_dotenv()
-
 def check_o3_access():
     """Check if o3 model is accessible."""
+    from agents import Agent, Runner
+    
     try:
         agent = Agent(
             name="TestAgent",
@@ -19,15 +13,26 @@ def check_o3_access():
     except Exception as e:
         return False, str(e)
 
-print("Checking o3 model access...")
-success, message = check_o3_access()
 
-if success:
-    print(f"✅ SUCCESS! O3 is now accessible!")
-    print(f"Response: {message}")
-else:
-    if "must be verified" in message:
-        print(f"❌ Organization verification not yet propagated")
-        print(f"Error: {message[:200]}...")
+def main():
+    from dotenv import load_dotenv
+    
+    # Load environment variables
+    load_dotenv()
+    
+    print("Checking o3 model access...")
+    success, message = check_o3_access()
+    
+    if success:
+        print(f"✅ SUCCESS! O3 is now accessible!")
+        print(f"Response: {message}")
     else:
-        print(f"❌ Error: {message}")
\ No newline at end of file
+        if "must be verified" in message:
+            print(f"❌ Organization verification not yet propagated")
+            print(f"Error: {message[:200]}...")
+        else:
+            print(f"❌ Error: {message}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
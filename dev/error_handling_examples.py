@@ -7,11 +7,18 @@ in the production script generator.
 """
 
 from production_script_generator import ProductionScriptGenerator, ValidationError
+from functools import lru_cache
 import logging
 
 # Set up logging to see what's happening
 logging.basicConfig(level=logging.INFO)
 
+
+@lru_cache(maxsize=None)
+def get_generator(model_name: str) -> ProductionScriptGenerator:
+    """Reuse one generator (and its agent) per model instead of rebuilding it per call."""
+    return ProductionScriptGenerator(model_name=model_name, use_fallback=False)
+
 def demonstrate_error_handling():
     """Demonstrate various error handling scenarios."""
     
@@ -189,7 +196,7 @@ def demonstrate_custom_error_handling():
         
         # Try primary model
         try:
-            gen = ProductionScriptGenerator(model_name="o3-2025-04-16", use_fallback=False)
+            gen = get_generator("o3-2025-04-16")
             result = gen.generate_script(actor_name)
             if result["success"]:
                 print(f"✓ Generated with o3")
@@ -199,7 +206,7 @@ def demonstrate_custom_error_handling():
         
         # Try fallback model
         try:
-            gen = ProductionScriptGenerator(model_name="o3-mini-2025-01-31", use_fallback=False)
+            gen = get_generator("o3-mini-2025-01-31")
             result = gen.generate_script(actor_name)
             if result["success"]:
                 print(f"✓ Generated with o3-mini (fallback)")
@@ -67,6 +67,9 @@ Fragment. Fragment. Fragment. And [surprise facet].
 **BIO**  
 (Full narration here in continuous paragraphs—birth to present-day epilogue. No additional headings.)"""
     
+    # Template split around the name once, so building a prompt is a single join
+    _PROMPT_FRAGMENTS = SCRIPT_PROMPT_TEMPLATE.split("{actor_name}")
+    
     # Configuration
     DEFAULT_MODEL = "o3-2025-04-16"
     FALLBACK_MODEL = "o3-mini-2025-01-31"
@@ -292,7 +295,7 @@ Fragment. Fragment. Fragment. And [surprise facet].
             logger.info(f"Generating script for: {actor_name}")
             
             # Format prompt
-            prompt = self.SCRIPT_PROMPT_TEMPLATE.format(actor_name=actor_name)
+            prompt = actor_name.join(self._PROMPT_FRAGMENTS)
             
             # Generate script
             result = Runner.run_sync(self.agent, prompt)
@@ -0,0 +1,86 @@
+"""
+Disk-backed cache of LLM responses for repeated dev runs.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """
+    Stores one JSON file per (model, prompt) so re-running the same actor
+    skips the API call entirely.
+    """
+    
+    def __init__(self, cache_dir: str, enabled: bool = True, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory holding cached responses
+            enabled: If False, every lookup misses and nothing is stored
+            ttl_seconds: Entries older than this are ignored (None = never expire)
+        """
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "misses": 0}
+        if enabled:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Build the cache key for a model/prompt pair."""
+        payload = json.dumps({"model": model, "prompt": prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Key from make_key()
+            
+        Returns:
+            The cached data, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        
+        path = self._path(key)
+        try:
+            if self.ttl_seconds is not None and time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                self.stats["misses"] += 1
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.stats["misses"] += 1
+            return None
+        
+        self.stats["hits"] += 1
+        return data
+    
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        """
+        Store a response, replacing the file atomically.
+        
+        Args:
+            key: Key from make_key()
+            data: JSON-serializable response data
+        """
+        if not self.enabled:
+            return
+        
+        path = self._path(key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
\ No newline at end of file
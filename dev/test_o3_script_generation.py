@@ -1,8 +1,10 @@
 import os
 from agents import Agent, Runner
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 import json
+from functools import lru_cache
 from dotenv import load_dotenv
+from _prompts import build_prompt
 
 # Load environment variables from .env file
 load_dotenv()
@@ -12,28 +14,24 @@ load_dotenv()
 # Model name: "o3-2025-04-16"
 # Requires organization verification
 
-# Script generation prompt template
-SCRIPT_PROMPT_TEMPLATE = """You are writing a 5-minute biography video for **{actor_name}**.
 
-GLOBAL RULES  
-• 780–830 words (≈5 min @ 155 wpm).  
-• Action beats in historical-present; context may use past but never mix tenses in one sentence.  
-• Voice = confident "sports-doc storyteller": punchy, nostalgic, dry-witty; no Gen-Z slang.  
-• ≥ 8 explicit year stamps inside the narration; mention the actor's age at least twice.  
-• Around the 80–90-second mark, drop a short tension-raising **question**—ask it plainly; never label it.  
-• Weave one humorous callback in each later act.  
-• **Output only the words the narrator speaks**—no outros, CTAs, visuals, music cues, section headers, timelines, or tables.
-
-OUTPUT MARKDOWN FORMAT (exactly):  
-
-**{actor_name} — 5-MINUTE BIO SCRIPT (~XXX words)**  
-
-**HOOK**  
-Fragment. Fragment. Fragment. And [surprise facet].  
-{actor_name}'s [metaphor or superlative tied to a signature role]. **[Imperative callback, 2–4 words—verb-first, no pronouns], and let's get rollin'.**
-
-**BIO**  
-(Full narration here in continuous paragraphs—birth to present-day epilogue. No additional headings.)"""
+@lru_cache(maxsize=1024)
+def _estimate_cost(word_count: int) -> Tuple[int, float, float, float, float, str]:
+    """Cost figures for a script of word_count words, memoized per word count."""
+    # Rough token estimates
+    input_tokens = 285  # Prompt template + actor name
+    output_tokens = word_count * 1.5  # ~1.5 tokens per word
+    
+    # o3 pricing
+    input_price = 2.0  # $2 per 1M input tokens
+    output_price = 8.0  # $8 per 1M output tokens
+    
+    # Calculate costs
+    input_cost = (input_tokens / 1_000_000) * input_price
+    output_cost = (output_tokens / 1_000_000) * output_price
+    total_cost = input_cost + output_cost
+    
+    return input_tokens, output_tokens, input_cost, output_cost, total_cost, f"${total_cost:.4f}"
 
 
 class O3ScriptGenerator:
@@ -64,7 +62,7 @@ class O3ScriptGenerator:
         Returns:
             Dictionary containing the script and metadata
         """
-        prompt = SCRIPT_PROMPT_TEMPLATE.format(actor_name=actor_name)
+        prompt = build_prompt(actor_name)
         
         try:
             result = Runner.run_sync(self.agent, prompt)
@@ -79,14 +77,12 @@ class O3ScriptGenerator:
                 "success": True
             }
             
-            # Try to extract hook and bio sections
-            if "**HOOK**" in output and "**BIO**" in output:
-                parts = output.split("**BIO**")
-                hook_section = parts[0].split("**HOOK**")[1].strip() if "**HOOK**" in parts[0] else ""
-                bio_section = parts[1].strip() if len(parts) > 1 else ""
-                
-                script_data["hook"] = hook_section
-                script_data["bio"] = bio_section
+            # Try to extract hook and bio sections by slicing between the markers
+            hook_start = output.find("**HOOK**")
+            bio_start = output.find("**BIO**", hook_start + 1)
+            if hook_start >= 0 and bio_start >= 0:
+                script_data["hook"] = output[hook_start + len("**HOOK**"):bio_start].strip()
+                script_data["bio"] = output[bio_start + len("**BIO**"):].strip()
             
             return script_data
             
@@ -108,18 +104,8 @@ class O3ScriptGenerator:
         Returns:
             Dictionary with cost breakdown
         """
-        # Rough token estimates
-        input_tokens = 285  # Prompt template + actor name
-        output_tokens = script_data.get("word_count", 800) * 1.5  # ~1.5 tokens per word
-        
-        # o3 pricing
-        input_price = 2.0  # $2 per 1M input tokens
-        output_price = 8.0  # $8 per 1M output tokens
-        
-        # Calculate costs
-        input_cost = (input_tokens / 1_000_000) * input_price
-        output_cost = (output_tokens / 1_000_000) * output_price
-        total_cost = input_cost + output_cost
+        input_tokens, output_tokens, input_cost, output_cost, total_cost, total_cost_usd = \
+            _estimate_cost(script_data.get("word_count", 800))
         
         return {
             "input_tokens": input_tokens,
@@ -127,10 +113,9 @@ class O3ScriptGenerator:
             "input_cost": input_cost,
             "output_cost": output_cost,
             "total_cost": total_cost,
-            "total_cost_usd": f"${total_cost:.4f}"
+            "total_cost_usd": total_cost_usd
         }
 
-
 def test_o3_script_generation():
     """
     Test script generation with the o3 model.
@@ -1,31 +1,13 @@
 import os
-from agents import Agent, Runner
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
 
-# Script generation prompt template
-SCRIPT_PROMPT_TEMPLATE = """You are writing a 5-minute biography video for **{actor_name}**.
+from _prompts import build_prompt
 
-GLOBAL RULES  
-• 780–830 words (≈5 min @ 155 wpm).  
-• Action beats in historical-present; context may use past but never mix tenses in one sentence.  
-• Voice = confident "sports-doc storyteller": punchy, nostalgic, dry-witty; no Gen-Z slang.  
-• ≥ 8 explicit year stamps inside the narration; mention the actor's age at least twice.  
-• Insert one mini cliff-hanger around the 80–90 s mark; weave a humorous callback in each later act.  
-• **Output only the words the narrator speaks**—no outros, CTAs, visuals, music cues, section headers, timelines, or tables.
+if TYPE_CHECKING:
+    from agents import Agent
 
-OUTPUT MARKDOWN FORMAT (exactly):  
 
-**{actor_name} — 5-MINUTE BIO SCRIPT (~XXX words)**  
-
-**HOOK**  
-Fragment. Fragment. Fragment. And [surprise facet].  
-{actor_name}'s [metaphor or superlative tied to a signature role]. **[Custom, hook-relevant action phrase], and let's get rollin'.**
-
-**BIO**  
-(Full narration here in continuous paragraphs—from birth to present-day epilogue. No additional headings.)"""
-
-
-def create_script_agent(use_persistent_instructions: bool = True) -> Agent:
+def create_script_agent(use_persistent_instructions: bool = True) -> "Agent":
     """
     Create an agent for script generation.
     
@@ -36,6 +18,8 @@ def create_script_agent(use_persistent_instructions: bool = True) -> Agent:
     Returns:
         Agent configured for script generation
     """
+    from agents import Agent
+    
     if use_persistent_instructions:
         # Agent with pre-configured instructions
         return Agent(
@@ -51,20 +35,24 @@ def create_script_agent(use_persistent_instructions: bool = True) -> Agent:
         )
 
 
-def generate_script_with_persistent_agent(agent: Agent, actor_name: str) -> str:
+def generate_script_with_persistent_agent(agent: "Agent", actor_name: str) -> str:
     """
     Generate script using an agent with persistent instructions.
     """
-    prompt = SCRIPT_PROMPT_TEMPLATE.format(actor_name=actor_name)
+    from agents import Runner
+    
+    prompt = build_prompt(actor_name)
     result = Runner.run_sync(agent, prompt)
     return result.final_output
 
 
-def generate_script_with_basic_agent(agent: Agent, actor_name: str) -> str:
+def generate_script_with_basic_agent(agent: "Agent", actor_name: str) -> str:
     """
     Generate script using a basic agent (full prompt each time).
     """
-    prompt = SCRIPT_PROMPT_TEMPLATE.format(actor_name=actor_name)
+    from agents import Runner
+    
+    prompt = build_prompt(actor_name)
     result = Runner.run_sync(agent, prompt)
     return result.final_output
 
@@ -3,6 +3,7 @@ Test the updated prompt with imperative callback (verb-first, no pronouns)
 """
 
 from production_script_generator import ProductionScriptGenerator
+from callback_validator import validate_callback
 
 # Initialize generator
 generator = ProductionScriptGenerator(model_name="o3-2025-04-16")
@@ -31,29 +32,22 @@ if result["success"]:
         # Check if it includes an imperative callback (should be 2-4 words, verb-first, no pronouns)
         hook_text = result["hook"]
         if "**" in hook_text and "let's get rollin'" in hook_text:
-            # Extract the callback phrase
-            import re
-            callback_match = re.search(r'\*\*([^*]+), and let\'s get rollin\'\.\*\*', hook_text)
-            if callback_match:
-                callback = callback_match.group(1)
-                word_count = len(callback.split())
-                print(f"\n✓ Imperative callback found: '{callback}'")
-                print(f"  Word count: {word_count} words")
-                if 2 <= word_count <= 4:
+            # Extract and check the callback phrase
+            check = validate_callback(hook_text)
+            if check:
+                print(f"\n✓ Imperative callback found: '{check['callback']}'")
+                print(f"  Word count: {check['word_count']} words")
+                if check["meets_length"]:
                     print(f"  ✓ Meets 2-4 word requirement")
                 else:
                     print(f"  ⚠️  Outside 2-4 word range")
                 
                 # Check if it's verb-first (basic check)
-                first_word = callback.split()[0].lower()
-                print(f"  First word: '{first_word}' (should be an imperative verb)")
+                print(f"  First word: '{check['first_word']}' (should be an imperative verb)")
                 
                 # Check for pronouns (should not have any)
-                pronouns = ['i', 'me', 'my', 'mine', 'we', 'us', 'our', 'ours', 'you', 'your', 'yours', 'he', 'him', 'his', 'she', 'her', 'hers', 'it', 'its', 'they', 'them', 'their', 'theirs']
-                words = callback.lower().split()
-                found_pronouns = [w for w in words if w in pronouns]
-                if found_pronouns:
-                    print(f"  ⚠️  Contains pronouns: {found_pronouns}")
+                if check["pronouns"]:
+                    print(f"  ⚠️  Contains pronouns: {check['pronouns']}")
                 else:
                     print(f"  ✓ No pronouns found")
     
@@ -2,6 +2,7 @@
 Test the updated prompt with the new question format
 """
 
+import re
 from production_script_generator import ProductionScriptGenerator
 import json
 
@@ -27,12 +28,19 @@ if result["success"]:
     script_text = result["full_script"]
     
     # Find the section around 80-90 seconds (approximately 200-250 words in)
-    words = script_text.split()
-    if len(words) > 250:
-        # Get roughly the 200-250 word range
-        preview_start = 200
-        preview_end = min(300, len(words))
-        preview = ' '.join(words[preview_start:preview_end])
+    # Walk word matches only as far as word 300 instead of splitting the whole script
+    preview_start = preview_end = None
+    word_count = 0
+    for word_count, match in enumerate(re.finditer(r"\S+", script_text), 1):
+        if word_count == 201:
+            preview_start = match.start()
+        preview_end = match.end()
+        if word_count == 300:
+            break
+    
+    if word_count > 250:
+        # Get roughly the 200-300 word range
+        preview = script_text[preview_start:preview_end]
         
         print(f"\n\nPreview of script around 80-90 second mark:")
         print("-" * 60)
@@ -1,8 +1,18 @@
+import asyncio
 import os
+import sys
+import time
 from agents import Agent, Runner
-from typing import Dict, Any
+from openai import OpenAI
+from typing import Dict, Any, List, Optional
 import json
 from dotenv import load_dotenv
+from _prompts import build_batch_prompt, build_prompt, split_batch_output
+from response_cache import ResponseCache
+
+# Shared JSON helpers live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from json_utils import write_json
 
 # Load environment variables from .env file
 load_dotenv()
@@ -12,52 +22,42 @@ load_dotenv()
 # o3-mini pricing: Lower cost option available
 # Model names: "o3-mini-2025-01-31" for o3-mini (available now)
 
-# Script generation prompt template
-SCRIPT_PROMPT_TEMPLATE = """You are writing a 5-minute biography video for **{actor_name}**.
-
-GLOBAL RULES  
-• 780–830 words (≈5 min @ 155 wpm).  
-• Action beats in historical-present; context may use past but never mix tenses in one sentence.  
-• Voice = confident "sports-doc storyteller": punchy, nostalgic, dry-witty; no Gen-Z slang.  
-• ≥ 8 explicit year stamps inside the narration; mention the actor's age at least twice.  
-• Around the 80–90-second mark, drop a short tension-raising **question**—ask it plainly; never label it.  
-• Weave one humorous callback in each later act.  
-• **Output only the words the narrator speaks**—no outros, CTAs, visuals, music cues, section headers, timelines, or tables.
-
-OUTPUT MARKDOWN FORMAT (exactly):  
-
-**{actor_name} — 5-MINUTE BIO SCRIPT (~XXX words)**  
-
-**HOOK**  
-Fragment. Fragment. Fragment. And [surprise facet].  
-{actor_name}'s [metaphor or superlative tied to a signature role]. **[Imperative callback, 2–4 words—verb-first, no pronouns], and let's get rollin'.**
-
-**BIO**  
-(Full narration here in continuous paragraphs—birth to present-day epilogue. No additional headings.)"""
-
 
 class ScriptGenerator:
     """
     A class to handle script generation using OpenAI's o3 model.
     """
     
-    def __init__(self, model_name: str = "o3-mini-2025-01-31", use_mini: bool = True):
+    # Cached prompt-prefix input tokens cost this fraction of the normal input price
+    CACHED_INPUT_PRICE_RATIO = 0.25
+    # Batch API requests cost this fraction of the synchronous price
+    BATCH_PRICE_RATIO = 0.5
+    
+    INSTRUCTIONS = "You are an expert biography script writer for YouTube videos. Follow the exact formatting and rules provided in each request."
+    
+    def __init__(self, model_name: str = "o3-mini-2025-01-31", use_mini: bool = True,
+                 use_cache: bool = True, cache_dir: str = "output/response_cache",
+                 cache_ttl_seconds: Optional[float] = None):
         """
         Initialize the script generator.
         
         Args:
             model_name: The specific o3 model version to use
             use_mini: If True, uses o3-mini for lower cost
+            use_cache: Reuse stored responses for identical model/prompt pairs
+            cache_dir: Directory for the response cache
+            cache_ttl_seconds: Ignore cached responses older than this
         """
         self.model_name = model_name  # Already using o3-mini by default
         self.agent = self._create_agent()
+        self.cache = ResponseCache(cache_dir, enabled=use_cache, ttl_seconds=cache_ttl_seconds)
         
     def _create_agent(self) -> Agent:
         """Create the script writing agent."""
         return Agent(
             name="ScriptWriter",
             model=self.model_name,
-            instructions="You are an expert biography script writer for YouTube videos. Follow the exact formatting and rules provided in each request."
+            instructions=self.INSTRUCTIONS
         )
     
     def generate_script(self, actor_name: str) -> Dict[str, Any]:
@@ -70,32 +70,51 @@ class ScriptGenerator:
         Returns:
             Dictionary containing the script and metadata
         """
-        prompt = SCRIPT_PROMPT_TEMPLATE.format(actor_name=actor_name)
+        prompt = build_prompt(actor_name)
+        
+        # Identical model/prompt pairs were already paid for; reuse the stored result
+        cache_key = ResponseCache.make_key(self.model_name, prompt)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             result = Runner.run_sync(self.agent, prompt)
-            
-            # Parse the output to extract sections
-            output = result.final_output
-            script_data = {
+            return self._finish_result(actor_name, cache_key, result)
+        except Exception as e:
+            return {
                 "actor_name": actor_name,
-                "full_script": output,
-                "word_count": len(output.split()),
-                "model_used": self.model_name,
-                "success": True
+                "error": str(e),
+                "success": False,
+                "model_used": self.model_name
             }
+    
+    async def generate_script_async(self, actor_name: str,
+                                    semaphore: Optional[asyncio.Semaphore] = None) -> Dict[str, Any]:
+        """
+        Async version of generate_script, for running several actors concurrently.
+        
+        Args:
+            actor_name: Name of the actor to write about
+            semaphore: Optional semaphore bounding concurrent requests
             
-            # Try to extract hook and bio sections
-            if "**HOOK**" in output and "**BIO**" in output:
-                parts = output.split("**BIO**")
-                hook_section = parts[0].split("**HOOK**")[1].strip() if "**HOOK**" in parts[0] else ""
-                bio_section = parts[1].strip() if len(parts) > 1 else ""
-                
-                script_data["hook"] = hook_section
-                script_data["bio"] = bio_section
-            
-            return script_data
-            
+        Returns:
+            Dictionary containing the script and metadata
+        """
+        prompt = build_prompt(actor_name)
+        
+        cache_key = ResponseCache.make_key(self.model_name, prompt)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            if semaphore is None:
+                result = await Runner.run(self.agent, prompt)
+            else:
+                async with semaphore:
+                    result = await Runner.run(self.agent, prompt)
+            return self._finish_result(actor_name, cache_key, result)
         except Exception as e:
             return {
                 "actor_name": actor_name,
@@ -104,6 +123,271 @@ class ScriptGenerator:
                 "model_used": self.model_name
             }
     
+    async def generate_scripts_async(self, actor_names: List[str],
+                                     max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Generate one script per actor with up to max_concurrency requests in flight.
+        
+        Args:
+            actor_names: Names of the actors to write about
+            max_concurrency: Upper bound on simultaneous requests (rate limits)
+            
+        Returns:
+            One script dictionary per actor, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        return await asyncio.gather(
+            *(self.generate_script_async(actor_name, semaphore) for actor_name in actor_names)
+        )
+    
+    def _get_cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up a stored response, flagged so estimate_cost doesn't bill its usage again."""
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached["cached"] = True
+        return cached
+    
+    @staticmethod
+    def _extract_usage(result) -> Optional[Dict[str, Any]]:
+        """Token usage of a run, including input tokens served from the prompt cache."""
+        usage = getattr(getattr(result, 'context_wrapper', None), 'usage', None)
+        if usage is None:
+            return None
+        input_details = getattr(usage, 'input_tokens_details', None)
+        return {
+            "input_tokens": getattr(usage, 'input_tokens', None),
+            "output_tokens": getattr(usage, 'output_tokens', None),
+            "cached_input_tokens": getattr(input_details, 'cached_tokens', 0) or 0
+        }
+    
+    def _finish_result(self, actor_name: str, cache_key: str, result) -> Dict[str, Any]:
+        """Parse a run result, record its token usage and store it in the cache."""
+        # Parse the output to extract sections
+        script_data = self._build_script_data(actor_name, result.final_output)
+        
+        usage = self._extract_usage(result)
+        if usage is not None:
+            script_data["usage"] = usage
+        
+        self.cache.set(cache_key, script_data)
+        return script_data
+    
+    def generate_scripts_batch(self, actor_names: List[str]) -> List[Dict[str, Any]]:
+        """
+        Generate scripts for several actors with a single request.
+        
+        The rules block is sent once for the whole list instead of once per
+        actor; each script in the response is labelled with its subject.
+        Actors already in the response cache are not requested again, and
+        each returned script is cached like a single-actor response.
+        
+        Args:
+            actor_names: Names of the actors to write about
+            
+        Returns:
+            One script dictionary per actor, in input order
+        """
+        cache_keys = {
+            actor_name: ResponseCache.make_key(self.model_name, build_prompt(actor_name))
+            for actor_name in actor_names
+        }
+        scripts: Dict[str, Dict[str, Any]] = {}
+        for actor_name, cache_key in cache_keys.items():
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                scripts[actor_name] = cached
+        
+        misses = [actor_name for actor_name in cache_keys if actor_name not in scripts]
+        if misses:
+            scripts.update(self._run_batch(misses, cache_keys))
+        
+        return [scripts[actor_name] for actor_name in actor_names]
+    
+    def _run_batch(self, actor_names: List[str], cache_keys: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Request scripts for actor_names in one call and cache each one returned.
+        
+        Args:
+            actor_names: Names of the actors to write about
+            cache_keys: Response cache key for each actor
+            
+        Returns:
+            Script dictionary per actor; actors missing from the response get an error
+        """
+        prompt = build_batch_prompt(actor_names)
+        
+        try:
+            result = Runner.run_sync(self.agent, prompt)
+        except Exception as e:
+            return {
+                actor_name: {"actor_name": actor_name, "error": str(e), "success": False, "model_used": self.model_name}
+                for actor_name in actor_names
+            }
+        
+        outputs = split_batch_output(result.final_output, actor_names)
+        usage = self._extract_usage(result)
+        total_words = sum(len(output.split()) for output in outputs.values()) or 1
+        
+        scripts = {}
+        for actor_name in actor_names:
+            if actor_name not in outputs:
+                scripts[actor_name] = {
+                    "actor_name": actor_name,
+                    "error": "No script returned for this actor in the batch response",
+                    "success": False,
+                    "model_used": self.model_name
+                }
+                continue
+            
+            script_data = self._build_script_data(actor_name, outputs[actor_name])
+            if usage is not None:
+                # The shared prompt is split evenly; output tokens follow each script's length
+                script_data["usage"] = {
+                    "input_tokens": round((usage["input_tokens"] or 0) / len(outputs)),
+                    "output_tokens": round((usage["output_tokens"] or 0) * script_data["word_count"] / total_words),
+                    "cached_input_tokens": round(usage["cached_input_tokens"] / len(outputs))
+                }
+            self.cache.set(cache_keys[actor_name], script_data)
+            scripts[actor_name] = script_data
+        return scripts
+    
+    def submit_batch(self, actor_names: List[str], batch_dir: str = "dev/llm") -> str:
+        """
+        Submit script requests to the OpenAI Batch API (half price, no RPM usage).
+        
+        Args:
+            actor_names: Names of the actors to write about
+            batch_dir: Where to write the JSONL request file
+            
+        Returns:
+            The batch id, for poll_batch()
+        """
+        requests_jsonl = "\n".join(
+            json.dumps({
+                "custom_id": actor_name,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model_name,
+                    "messages": [
+                        {"role": "system", "content": self.INSTRUCTIONS},
+                        {"role": "user", "content": build_prompt(actor_name)}
+                    ]
+                }
+            })
+            for actor_name in actor_names
+        )
+        
+        input_path = os.path.join(batch_dir, f"batch_input_{int(time.time())}.jsonl")
+        with open(input_path, 'w', encoding='utf-8') as f:
+            f.write(requests_jsonl + "\n")
+        
+        client = OpenAI()
+        with open(input_path, 'rb') as f:
+            batch_file = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    def poll_batch(self, batch_id: str, poll_interval: float = 60, output_dir: str = "dev/llm") -> List[Dict[str, Any]]:
+        """
+        Wait for a batch to finish and save one script JSON per actor.
+        
+        Args:
+            batch_id: Id returned by submit_batch()
+            poll_interval: Seconds between status checks
+            output_dir: Where to save the script JSON files
+            
+        Returns:
+            List of script dictionaries, with an error entry for every failed request
+        """
+        client = OpenAI()
+        while True:
+            batch = client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status: {batch.status}")
+            time.sleep(poll_interval)
+        
+        # Successful requests land in the output file and failed ones in the error
+        # file; either id is None when no request ended up there
+        records = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                records.extend(self._read_jsonl(client, file_id))
+        
+        results = []
+        for record in records:
+            actor_name = record["custom_id"]
+            response = record.get("response") or {}
+            
+            if record.get("error") or response.get("status_code") != 200:
+                results.append({
+                    "actor_name": actor_name,
+                    "error": str(record.get("error") or response.get("body")),
+                    "success": False,
+                    "model_used": self.model_name
+                })
+                continue
+            
+            body = response["body"]
+            script_data = self._build_script_data(actor_name, body["choices"][0]["message"]["content"])
+            usage = body.get("usage") or {}
+            script_data["usage"] = {
+                "input_tokens": usage.get("prompt_tokens"),
+                "output_tokens": usage.get("completion_tokens"),
+                "cached_input_tokens": (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+            }
+            script_data["batch_mode"] = True
+            
+            filename = os.path.join(output_dir, f"script_{actor_name.replace(' ', '_').lower()}.json")
+            write_json(filename, script_data)
+            results.append(script_data)
+        
+        # Any request without a record in either file is reported as failed too
+        returned = {result["actor_name"] for result in results}
+        for request in self._read_jsonl(client, batch.input_file_id):
+            actor_name = request["custom_id"]
+            if actor_name not in returned:
+                results.append({
+                    "actor_name": actor_name,
+                    "error": "No output returned for this request",
+                    "success": False,
+                    "model_used": self.model_name
+                })
+        
+        return results
+    
+    @staticmethod
+    def _read_jsonl(client: OpenAI, file_id: str) -> List[Dict[str, Any]]:
+        """Download a Batch API file and parse one JSON record per line."""
+        return [json.loads(line) for line in client.files.content(file_id).text.splitlines() if line.strip()]
+    
+    def _build_script_data(self, actor_name: str, output: str) -> Dict[str, Any]:
+        """Build the script dictionary for one script's text."""
+        script_data = {
+            "actor_name": actor_name,
+            "full_script": output,
+            "word_count": len(output.split()),
+            "model_used": self.model_name,
+            "success": True
+        }
+        
+        # Try to extract hook and bio sections
+        if "**HOOK**" in output and "**BIO**" in output:
+            parts = output.split("**BIO**")
+            hook_section = parts[0].split("**HOOK**")[1].strip() if "**HOOK**" in parts[0] else ""
+            bio_section = parts[1].strip() if len(parts) > 1 else ""
+            
+            script_data["hook"] = hook_section
+            script_data["bio"] = bio_section
+        
+        return script_data
+    
     def estimate_cost(self, script_data: Dict[str, Any]) -> Dict[str, float]:
         """
         Estimate the API cost for the script generation.
@@ -115,9 +399,11 @@ class ScriptGenerator:
         Returns:
             Dictionary with cost breakdown
         """
-        # Rough token estimates
-        input_tokens = 285  # Prompt template + actor name
-        output_tokens = script_data.get("word_count", 800) * 1.5  # ~1.5 tokens per word
+        # Use actual token counts when available, otherwise rough estimates
+        usage = script_data.get("usage") or {}
+        input_tokens = usage.get("input_tokens") or 285  # Prompt template + actor name
+        output_tokens = usage.get("output_tokens") or script_data.get("word_count", 800) * 1.5  # ~1.5 tokens per word
+        cached_input_tokens = usage.get("cached_input_tokens", 0)
         
         # Pricing per million tokens
         if "mini" in self.model_name.lower():
@@ -128,13 +414,25 @@ class ScriptGenerator:
             input_price = 2.0  # $2 per 1M input tokens
             output_price = 8.0  # $8 per 1M output tokens
         
-        # Calculate costs
-        input_cost = (input_tokens / 1_000_000) * input_price
+        # A response served from the cache made no API call
+        if script_data.get("cached"):
+            input_price = output_price = 0.0
+        
+        # Batch API requests are billed at a discount
+        if script_data.get("batch_mode"):
+            input_price *= self.BATCH_PRICE_RATIO
+            output_price *= self.BATCH_PRICE_RATIO
+        
+        # Calculate costs; input tokens served from the prompt cache are billed at a discount
+        uncached_input_tokens = input_tokens - cached_input_tokens
+        input_cost = ((uncached_input_tokens + cached_input_tokens * self.CACHED_INPUT_PRICE_RATIO)
+                      / 1_000_000) * input_price
         output_cost = (output_tokens / 1_000_000) * output_price
         total_cost = input_cost + output_cost
         
         return {
             "input_tokens": input_tokens,
+            "cached_input_tokens": cached_input_tokens,
             "output_tokens": output_tokens,
             "input_cost": input_cost,
             "output_cost": output_cost,
@@ -164,15 +462,25 @@ def test_script_generation():
     print("\n1. Testing with o3-mini model...")
     generator = ScriptGenerator()
     
-    for actor in test_actors:
-        print(f"\nGenerating script for: {actor}")
+    # Generate all scripts with one request
+    print(f"\nGenerating scripts for: {', '.join(test_actors)}")
+    results = generator.generate_scripts_batch(test_actors)
+    
+    # Retry any actors the batch response missed with concurrent per-actor requests
+    failed = [actor for actor, result in zip(test_actors, results) if not result["success"]]
+    if failed:
+        print(f"Retrying individually: {', '.join(failed)}")
+        retried = dict(zip(failed, asyncio.run(generator.generate_scripts_async(failed))))
+        results = [retried.get(actor, result) for actor, result in zip(test_actors, results)]
+    
+    for actor, result in zip(test_actors, results):
+        print(f"\nScript for: {actor}")
         print("-" * 40)
         
-        # Generate script
-        result = generator.generate_script(actor)
-        
         if result["success"]:
             print(f"✓ Script generated successfully")
+            if result.get("cached"):
+                print(f"  Served from the response cache (no API cost)")
             print(f"  Word count: {result['word_count']}")
             
             # Show first few lines of hook
@@ -187,8 +495,7 @@ def test_script_generation():
             
             # Save to file for review in dev/llm folder
             filename = f"dev/llm/script_{actor.replace(' ', '_').lower()}.json"
-            with open(filename, 'w') as f:
-                json.dump(result, f, indent=2)
+            write_json(filename, result)
             print(f"  Saved to: {filename}")
             
         else:
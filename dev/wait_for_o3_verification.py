@@ -1,39 +1,60 @@
+import asyncio
 import os
 import time
 from agents import Agent, Runner
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 from datetime import datetime
 
 # Load environment variables
 load_dotenv()
 
-def check_o3_access():
+O3_MODEL = "o3-2025-04-16"
+
+def make_prober():
+    """Build the agent used to probe o3 access; build once and reuse across checks."""
+    return Agent(
+        name="TestAgent",
+        model=O3_MODEL,
+        instructions="You are a test agent."
+    )
+
+async def check_o3_access_async(agent, client=None):
     """Check if o3 model is accessible."""
     try:
-        agent = Agent(
-            name="TestAgent",
-            model="o3-2025-04-16",
-            instructions="You are a test agent."
-        )
-        result = Runner.run_sync(agent, "Say 'O3 access confirmed!'")
+        # A model lookup is free; skip the billed probe while the model isn't even listed
+        if client is not None:
+            await client.models.retrieve(O3_MODEL)
+        # Listing alone doesn't prove the organization is verified, so still run a short probe
+        result = await Runner.run(agent, "Say 'O3 access confirmed!'")
         return True, result.final_output
     except Exception as e:
         return False, str(e)
 
-def wait_for_o3_verification(max_wait_minutes=15, check_interval_seconds=60):
+def check_o3_access(agent=None):
+    """Check if o3 model is accessible."""
+    return asyncio.run(check_o3_access_async(agent or make_prober()))
+
+async def wait_for_o3_verification_async(max_wait_minutes=15, check_interval_seconds=60,
+                                         initial_interval_seconds=5, backoff_factor=1.5):
     """
-    Wait for o3 verification to propagate.
+    Wait for o3 verification to propagate, polling with exponential backoff.
     
     Args:
         max_wait_minutes: Maximum time to wait in minutes
-        check_interval_seconds: Time between checks in seconds
+        check_interval_seconds: Longest time between checks in seconds
+        initial_interval_seconds: Time before the second check in seconds
+        backoff_factor: Growth of the interval after each failed check
     """
     start_time = time.time()
     max_wait_seconds = max_wait_minutes * 60
     check_count = 0
+    interval = min(initial_interval_seconds, check_interval_seconds)
+    agent = make_prober()
+    client = AsyncOpenAI()
     
     print(f"Waiting for o3 verification to propagate...")
-    print(f"Will check every {check_interval_seconds} seconds for up to {max_wait_minutes} minutes")
+    print(f"Will check every {interval}-{check_interval_seconds} seconds for up to {max_wait_minutes} minutes")
     print("-" * 60)
     
     while time.time() - start_time < max_wait_seconds:
@@ -41,7 +62,7 @@ def wait_for_o3_verification(max_wait_minutes=15, check_interval_seconds=60):
         current_time = datetime.now().strftime("%H:%M:%S")
         print(f"\nCheck #{check_count} at {current_time}")
         
-        success, message = check_o3_access()
+        success, message = await check_o3_access_async(agent, client)
         
         if success:
             print(f"✅ SUCCESS! O3 is now accessible!")
@@ -55,13 +76,26 @@ def wait_for_o3_verification(max_wait_minutes=15, check_interval_seconds=60):
             else:
                 print(f"❌ Unexpected error: {message[:200]}...")
         
-        if time.time() - start_time + check_interval_seconds < max_wait_seconds:
-            print(f"Waiting {check_interval_seconds} seconds before next check...")
-            time.sleep(check_interval_seconds)
+        if time.time() - start_time + interval < max_wait_seconds:
+            print(f"Waiting {int(interval)} seconds before next check...")
+            await asyncio.sleep(interval)
+            interval = min(interval * backoff_factor, check_interval_seconds)
+        else:
+            break
     
     print(f"\n❌ Timeout: Verification did not propagate within {max_wait_minutes} minutes")
     return False
 
+def wait_for_o3_verification(max_wait_minutes=15, check_interval_seconds=60):
+    """
+    Wait for o3 verification to propagate.
+    
+    Args:
+        max_wait_minutes: Maximum time to wait in minutes
+        check_interval_seconds: Longest time between checks in seconds
+    """
+    return asyncio.run(wait_for_o3_verification_async(max_wait_minutes, check_interval_seconds))
+
 if __name__ == "__main__":
     # Wait for up to 10 more minutes (since 5 have already passed)
     if wait_for_o3_verification(max_wait_minutes=10, check_interval_seconds=60):
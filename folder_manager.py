@@ -5,8 +5,10 @@ Folder management utilities for organizing actor projects.
 
 import os
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from functools import lru_cache
 import re
+import unicodedata
 
 
 class ActorFolderManager:
@@ -14,6 +16,17 @@ class ActorFolderManager:
     Manages folder structure for actor projects.
     """
     
+    # Characters stripped from actor names (anything but word chars, spaces, hyphens, apostrophes)
+    _NORMALIZE_RE = re.compile(r"[^\w\s\-']")
+    
+    # Leading shot number, directly followed by the image letter
+    _SHOT_NUM_RE = re.compile(r"^(\d+)(?=[^\W\d_])")
+    
+    _IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'})
+    
+    # Generational suffixes that stay last when a "Last, First" name is reordered
+    _NAME_SUFFIXES = frozenset({'jr', 'sr', 'ii', 'iii', 'iv'})
+    
     def __init__(self, base_output_dir: str = "output"):
         """
         Initialize the folder manager.
@@ -23,6 +36,10 @@ class ActorFolderManager:
         """
         self.base_output_dir = base_output_dir
         self.actors_dir = os.path.join(base_output_dir, "actors")
+        # Per-instance caches keyed by (normalized name, canonical key); only folders
+        # known to exist are cached
+        self._folder_cache: Dict[Tuple[str, str], str] = {}
+        self._paths_cache: Dict[Tuple[str, str], Dict[str, str]] = {}
         self._ensure_base_directories()
     
     def _ensure_base_directories(self):
@@ -30,10 +47,12 @@ class ActorFolderManager:
         Path(self.base_output_dir).mkdir(exist_ok=True)
         Path(self.actors_dir).mkdir(exist_ok=True)
     
-    def normalize_actor_name(self, actor_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def normalize_actor_name(actor_name: str) -> str:
         """
         Normalize actor name for folder creation.
-        Converts to lowercase and replaces spaces with underscores.
+        Folds diacritics, converts to lowercase and replaces whitespace with underscores.
         
         Args:
             actor_name: The actor's name
@@ -41,12 +60,40 @@ class ActorFolderManager:
         Returns:
             Normalized folder name
         """
+        # Fold accents ("Penélope" -> "Penelope"); non-Latin letters are kept as-is
+        decomposed = unicodedata.normalize("NFKD", actor_name)
+        folded = "".join(char for char in decomposed if not unicodedata.combining(char))
         # Remove any special characters except spaces, hyphens, apostrophes
-        cleaned = re.sub(r"[^\w\s\-']", "", actor_name)
-        # Replace spaces with underscores and convert to lowercase
-        normalized = cleaned.lower().replace(" ", "_").replace("'", "")
+        cleaned = ActorFolderManager._NORMALIZE_RE.sub("", folded)
+        # Replace whitespace runs with underscores and convert to lowercase
+        normalized = "_".join(cleaned.lower().split()).replace("'", "")
         return normalized
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def canonical_actor_key(actor_name: str) -> str:
+        """
+        Key for matching name variants.
+        Puts "Last, First" names back in reading order before normalizing, so
+        "Downey, Robert Jr." and "robert downey jr" map to the same key.
+        
+        Args:
+            actor_name: The actor's name or an existing folder name
+            
+        Returns:
+            Normalized name in reading order
+        """
+        last, comma, given = actor_name.partition(",")
+        if comma:
+            given_tokens = given.split()
+            # Keep generational suffixes at the end: "Downey, Robert Jr." -> "Robert Downey Jr."
+            normalize = ActorFolderManager.normalize_actor_name
+            split = len(given_tokens)
+            while split and normalize(given_tokens[split - 1]) in ActorFolderManager._NAME_SUFFIXES:
+                split -= 1
+            actor_name = " ".join(given_tokens[:split] + [last] + given_tokens[split:])
+        return ActorFolderManager.normalize_actor_name(actor_name)
+    
     def find_existing_actor_folder(self, actor_name: str) -> Optional[str]:
         """
         Find existing actor folder (case-insensitive).
@@ -57,23 +104,49 @@ class ActorFolderManager:
         Returns:
             Path to existing folder or None
         """
-        normalized_name = self.normalize_actor_name(actor_name)
+        return self._find_folder_from_normalized(
+            self.normalize_actor_name(actor_name), self.canonical_actor_key(actor_name)
+        )
+    
+    def _find_folder_from_normalized(self, normalized_name: str, canonical_key: str) -> Optional[str]:
+        """
+        Find existing actor folder from an already normalized name.
         
-        # Check for exact match first
-        exact_path = os.path.join(self.actors_dir, normalized_name)
-        if os.path.exists(exact_path):
-            return exact_path
+        Args:
+            normalized_name: Result of normalize_actor_name()
+            canonical_key: Result of canonical_actor_key() for the same name
+            
+        Returns:
+            Path to existing folder or None
+        """
+        cache_key = (normalized_name, canonical_key)
+        cached = self._folder_cache.get(cache_key)
+        if cached:
+            return cached
         
-        # Check for case-insensitive match
+        # One directory pass: return on an exact match, otherwise prefer a
+        # case-insensitive match over a variant of the same name
+        # (accents, punctuation or "Last, First" order differ)
+        lowered_name = normalized_name.lower()
+        case_match = None
+        variant_match = None
         try:
-            existing_folders = os.listdir(self.actors_dir)
-            for folder in existing_folders:
-                if folder.lower() == normalized_name.lower():
-                    return os.path.join(self.actors_dir, folder)
+            with os.scandir(self.actors_dir) as it:
+                for entry in it:
+                    if entry.name == normalized_name:
+                        self._folder_cache[cache_key] = entry.path
+                        return entry.path
+                    if case_match is None and entry.name.lower() == lowered_name:
+                        case_match = entry.path
+                    elif variant_match is None and self.canonical_actor_key(entry.name) == canonical_key:
+                        variant_match = entry.path
         except OSError:
             pass
         
-        return None
+        match = case_match or variant_match
+        if match:
+            self._folder_cache[cache_key] = match
+        return match
     
     def get_or_create_actor_folder(self, actor_name: str) -> str:
         """
@@ -82,18 +155,38 @@ class ActorFolderManager:
         Args:
             actor_name: The actor's name
             
+        Returns:
+            Path to actor folder
+        """
+        return self._get_or_create_from_normalized(
+            self.normalize_actor_name(actor_name), self.canonical_actor_key(actor_name)
+        )
+    
+    def _get_or_create_from_normalized(self, normalized_name: str, canonical_key: str) -> str:
+        """
+        Get existing actor folder or create new one from an already normalized name.
+        
+        Args:
+            normalized_name: Result of normalize_actor_name()
+            canonical_key: Result of canonical_actor_key() for the same name
+            
         Returns:
             Path to actor folder
         """
         # Check if folder already exists
-        existing_folder = self.find_existing_actor_folder(actor_name)
+        existing_folder = self._find_folder_from_normalized(normalized_name, canonical_key)
         if existing_folder:
             return existing_folder
         
-        # Create new folder
-        normalized_name = self.normalize_actor_name(actor_name)
+        # Create new folder; the lookup above already scanned for it, so just mkdir
         actor_folder = os.path.join(self.actors_dir, normalized_name)
-        Path(actor_folder).mkdir(exist_ok=True)
+        try:
+            os.mkdir(actor_folder)
+        except FileExistsError:
+            # Created concurrently since the lookup
+            pass
+        self._folder_cache[(normalized_name, canonical_key)] = actor_folder
+        self._paths_cache.pop((normalized_name, canonical_key), None)
         return actor_folder
     
     def find_existing_scripts(self, actor_folder: str) -> List[str]:
@@ -106,15 +199,17 @@ class ActorFolderManager:
         Returns:
             List of script file paths
         """
-        scripts = []
-        if os.path.exists(actor_folder):
-            for file in os.listdir(actor_folder):
-                if file.endswith("_script.txt") and "PHONETIC" not in file:
-                    scripts.append(os.path.join(actor_folder, file))
+        if not os.path.exists(actor_folder):
+            return []
+        
+        # DirEntry caches its stat, so the mtime sort costs no extra syscalls
+        with os.scandir(actor_folder) as it:
+            scripts = [(entry.stat().st_mtime, entry.path) for entry in it
+                       if entry.is_file() and entry.name.endswith("_script.txt") and "PHONETIC" not in entry.name]
         
         # Sort by modification time (newest first)
-        scripts.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-        return scripts
+        scripts.sort(reverse=True)
+        return [path for _, path in scripts]
     
     def get_latest_script(self, actor_name: str) -> Optional[str]:
         """
@@ -133,7 +228,7 @@ class ActorFolderManager:
         scripts = self.find_existing_scripts(actor_folder)
         return scripts[0] if scripts else None
     
-    def get_script_paths(self, actor_name: str) -> dict:
+    def get_script_paths(self, actor_name: str) -> Dict[str, str]:
         """
         Get standardized paths for script files.
         
@@ -143,19 +238,44 @@ class ActorFolderManager:
         Returns:
             Dictionary with paths for different file types
         """
-        actor_folder = self.get_or_create_actor_folder(actor_name)
-        normalized_name = self.normalize_actor_name(actor_name)
+        cache_key = (self.normalize_actor_name(actor_name), self.canonical_actor_key(actor_name))
+        paths = self._paths_cache.get(cache_key)
+        if paths is None:
+            paths = self._build_paths(*cache_key)
+            self._paths_cache[cache_key] = paths
+        return dict(paths)
+    
+    def _build_paths(self, normalized_name: str, canonical_key: str) -> Dict[str, str]:
+        """
+        Build the standardized file paths for an already normalized actor name.
+        
+        Args:
+            normalized_name: Result of normalize_actor_name()
+            canonical_key: Result of canonical_actor_key() for the same name
+            
+        Returns:
+            Dictionary with paths for different file types
+        """
+        actor_folder = self._get_or_create_from_normalized(normalized_name, canonical_key)
+        
+        # Files in a folder matched as a variant (legacy accents, "Last, First" order)
+        # carry that folder's name, not the name as typed now
+        folder_name = os.path.basename(actor_folder)
+        file_name = normalized_name if folder_name.lower() == normalized_name.lower() else folder_name
+        
+        # actor_folder never ends in a separator, so plain concatenation matches os.path.join
+        base = f"{actor_folder}{os.sep}{file_name}"
         
         return {
             "folder": actor_folder,
-            "script": os.path.join(actor_folder, f"{normalized_name}_script.txt"),
-            "phonetic": os.path.join(actor_folder, f"{normalized_name}_PHONETIC_script.txt"),
-            "json": os.path.join(actor_folder, f"{normalized_name}_script_data.json"),
-            "storyboard": os.path.join(actor_folder, f"{normalized_name}_storyboard.json"),
-            "music_plan": os.path.join(actor_folder, f"{normalized_name}_music_plan.json"),
-            "cost_tracking": os.path.join(actor_folder, f"{normalized_name}_cost_tracking.json"),
-            "images_dir": os.path.join(actor_folder, "images"),
-            "image_metadata": os.path.join(actor_folder, f"{normalized_name}_image_metadata.json")
+            "script": f"{base}_script.txt",
+            "phonetic": f"{base}_PHONETIC_script.txt",
+            "json": f"{base}_script_data.json",
+            "storyboard": f"{base}_storyboard.json",
+            "music_plan": f"{base}_music_plan.json",
+            "cost_tracking": f"{base}_cost_tracking.json",
+            "images_dir": f"{actor_folder}{os.sep}images",
+            "image_metadata": f"{base}_image_metadata.json"
         }
     
     def get_latest_storyboard(self, actor_name: str) -> Optional[str]:
@@ -215,25 +335,19 @@ class ActorFolderManager:
         }
         
         if os.path.exists(images_dir):
-            for filename in os.listdir(images_dir):
-                # Skip thumbnails directory
-                if filename == 'thumbnails':
-                    continue
-                    
-                if filename.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')):
+            with os.scandir(images_dir) as it:
+                # Skip the thumbnails directory and anything else that isn't a file
+                filenames = [entry.name for entry in it if entry.is_file()]
+            
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() in self._IMAGE_EXTENSIONS:
                     result["image_files"].append(filename)
                     result["total_images"] += 1
                     
-                    # Extract shot number
-                    try:
-                        # Handle filenames like "1B.jpg", "12C.png"
-                        for i, char in enumerate(filename):
-                            if char.isalpha():
-                                shot_num = int(filename[:i])
-                                result["shots_with_images"].add(shot_num)
-                                break
-                    except:
-                        pass
+                    # Extract shot number from filenames like "1B.jpg", "12C.png"
+                    match = self._SHOT_NUM_RE.match(filename)
+                    if match:
+                        result["shots_with_images"].add(int(match.group(1)))
             
             result["has_images"] = result["total_images"] > 0
             result["shots_with_images"] = sorted(list(result["shots_with_images"]))
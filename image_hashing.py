@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Perceptual image hashing for JGL Assistant.
+Used by the image searchers to spot re-encoded or resized copies of the same picture.
+"""
+
+import math
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image
+
+# pHash works on a 32x32 grayscale image and keeps the 8x8 lowest DCT frequencies
+_PHASH_IMAGE_SIZE = 32
+_PHASH_HASH_SIZE = 8
+_DCT_COSINES = [
+    [math.cos(math.pi * (2 * x + 1) * u / (2 * _PHASH_IMAGE_SIZE)) for x in range(_PHASH_IMAGE_SIZE)]
+    for u in range(_PHASH_HASH_SIZE)
+]
+
+
+def perceptual_hash(img: Image.Image) -> int:
+    """
+    Compute a 64-bit DCT perceptual hash, stable across re-encoding and resizing.
+
+    Args:
+        img: Opened PIL image
+
+    Returns:
+        Hash packed into an int, one bit per low-frequency coefficient
+    """
+    gray = img.convert('L').resize((_PHASH_IMAGE_SIZE, _PHASH_IMAGE_SIZE), Image.Resampling.LANCZOS)
+    pixels = list(gray.getdata())
+    rows = [pixels[i:i + _PHASH_IMAGE_SIZE] for i in range(0, len(pixels), _PHASH_IMAGE_SIZE)]
+
+    # Separable 2D DCT, only computing the coefficients that end up in the hash
+    row_coeffs = [[sum(c * p for c, p in zip(cosines, row)) for cosines in _DCT_COSINES] for row in rows]
+    coeffs = [
+        sum(c * row[u] for c, row in zip(_DCT_COSINES[v], row_coeffs))
+        for v in range(_PHASH_HASH_SIZE)
+        for u in range(_PHASH_HASH_SIZE)
+    ]
+
+    # Threshold against the median of the AC terms (the DC term only carries brightness)
+    median = sorted(coeffs[1:])[(len(coeffs) - 1) // 2]
+    phash = 0
+    for coeff in coeffs:
+        phash = (phash << 1) | (coeff > median)
+    return phash
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count the differing bits between two hashes."""
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """
+    BK-tree over integer hashes using Hamming distance.
+    Near-duplicate lookups only visit branches that can hold a match,
+    instead of comparing against every stored hash.
+    """
+
+    def __init__(self):
+        # Each node is (hash, {distance to parent: child node})
+        self._root: Optional[Tuple[int, Dict[int, Any]]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int) -> None:
+        """Insert a hash (exact repeats are stored once)."""
+        if self._root is None:
+            self._root = (value, {})
+            self._size = 1
+            return
+
+        node = self._root
+        while True:
+            distance = hamming_distance(value, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (value, {})
+                self._size += 1
+                return
+            node = child
+
+    def contains_within(self, value: int, max_distance: int) -> bool:
+        """
+        Check whether any stored hash is within max_distance bits of value.
+
+        Args:
+            value: Hash to look up
+            max_distance: Largest Hamming distance that counts as a match
+
+        Returns:
+            True if a stored hash is close enough
+        """
+        if self._root is None:
+            return False
+
+        stack = [self._root]
+        while stack:
+            node_value, children = stack.pop()
+            distance = hamming_distance(value, node_value)
+            if distance <= max_distance:
+                return True
+            # Triangle inequality: only children in this band can be within range
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return False
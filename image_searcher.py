@@ -4,24 +4,99 @@ Google Image search and download for video production.
 Downloads images based on storyboard search queries.
 """
 
+import atexit
 import os
-import json
 import time
 import logging
+import re
+import shutil
+import threading
+import weakref
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 import hashlib
 
+from json_utils import dumps, loads, read_json, write_json
+
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows bursts of up to capacity calls,
+    then about rate calls per second.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket full.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum stored tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping only if the bucket is empty."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _url_path(url: str) -> str:
+    """Path part of a URL by plain string slicing; urlparse only for URLs without a scheme."""
+    scheme_end = url.find('://')
+    if scheme_end == -1:
+        return urlparse(url).path
+    
+    # Drop fragment and query, then everything before the first slash (the host)
+    rest = url[scheme_end + 3:].split('#', 1)[0].split('?', 1)[0]
+    slash = rest.find('/')
+    return rest[slash:] if slash != -1 else ''
+
+
+@lru_cache(maxsize=4096)
+def _file_extension(url: str, mime_type: Optional[str] = None) -> str:
+    """Determine file extension from URL path, then MIME type, defaulting to .jpg."""
+    # Try from URL first
+    ext = os.path.splitext(_url_path(url))[1].lower()
+    if ext in ImageSearcher.SUPPORTED_EXTENSIONS:
+        return ext
+    
+    # Try from MIME type, then default to .jpg
+    return ImageSearcher._MIME_MAP.get((mime_type or '').lower(), '.jpg')
+
+
+def _flush_usage_at_exit(searcher_ref: "weakref.ReferenceType[ImageSearcher]") -> None:
+    """Exit hook; holds the searcher weakly so finished searchers can be collected."""
+    searcher = searcher_ref()
+    if searcher is not None:
+        searcher._flush_usage()
+
+
 class ImageSearcher:
     """
     Searches and downloads images using Google Custom Search API.
@@ -36,8 +111,42 @@ class ImageSearcher:
     # Results per search
     RESULTS_PER_SEARCH = 10
     
+    # Usage changes between writes of the usage file
+    USAGE_SAVE_EVERY = 10
+    
+    # Cached search results are reused for this long
+    SEARCH_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+    
     # Supported image extensions
-    SUPPORTED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
+    SUPPORTED_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'})
+    
+    # Extension to use when the URL doesn't have one
+    _MIME_MAP = {
+        'image/jpeg': '.jpg',
+        'image/jpg': '.jpg',
+        'image/png': '.png',
+        'image/gif': '.gif',
+        'image/webp': '.webp',
+        'image/bmp': '.bmp'
+    }
+    
+    # Letters for downloaded images, max 9 per shot (A is reserved for AI-generated)
+    _LETTERS = 'BCDEFGHIJ'
+    
+    # First downloaded image of a shot, e.g. "12B.jpg"
+    _EXISTING_IMAGE_RE = re.compile(r'^(\d+)B\.(?:jpg|jpeg|png|gif|webp|bmp)$', re.IGNORECASE)
+    
+    # Concurrent image downloads (I/O bound, so threads overlap the network waits)
+    MAX_DOWNLOAD_WORKERS = 16
+    
+    # Concurrent downloads from any single host
+    MAX_DOWNLOADS_PER_HOST = 4
+    
+    # Concurrent Google searches (kept under the API's per-second limit)
+    MAX_SEARCH_WORKERS = 8
+    
+    # Search API calls per second (Google allows about 10)
+    SEARCHES_PER_SECOND = 8.0
     
     def __init__(self, api_key: Optional[str] = None, search_engine_id: Optional[str] = None):
         """
@@ -55,18 +164,77 @@ class ImageSearcher:
         if not self.search_engine_id:
             raise ValueError("Search Engine ID not provided. Set GOOGLE_SEARCH_ENGINE_ID in .env file")
         
-        # Track daily usage
+        # Track daily usage (updated from search workers, so guarded by a lock)
         self.usage_file = "output/.google_api_usage.json"
+        self._usage_lock = threading.Lock()
+        # Orders usage file writes; held for the disk I/O so _usage_lock never is
+        self._usage_write_lock = threading.Lock()
+        self._usage_dirty = False
+        self._usage_updates = 0
+        os.makedirs(os.path.dirname(self.usage_file) or '.', exist_ok=True)
         self._load_usage()
+        atexit.register(_flush_usage_at_exit, weakref.ref(self))
+        
+        # Query-level cache of search results (disk, plus memory for this run)
+        self._search_cache_dir = Path("output/.cse_cache")
+        self._search_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._search_cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Paces API calls under Google's per-second limit; idle runs never wait
+        self._rate_limiter = TokenBucket(rate=self.SEARCHES_PER_SECOND, capacity=int(self.SEARCHES_PER_SECOND))
+        
+        # One pooled keep-alive session for API calls and downloads
+        self._session = self._create_session()
+        
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        # URL -> (download future, saved path), so repeated URLs are fetched once
+        self._downloads_by_url: Dict[str, Tuple[Future, str]] = {}
+        self._download_pool = ThreadPoolExecutor(max_workers=self.MAX_DOWNLOAD_WORKERS,
+                                                 thread_name_prefix="image-download")
         
         logger.info("Successfully initialized Google Image Searcher")
     
+    def close(self) -> None:
+        """Save pending usage, stop the download workers and close the pooled HTTP connections."""
+        self._download_pool.shutdown(wait=True)
+        self._flush_usage()
+        self._session.close()
+    
+    def _create_session(self) -> requests.Session:
+        """Create a requests session with a connection pool large enough for the download workers."""
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
+        # The search API gets a more patient policy: a 429 there would otherwise
+        # abort the storyboard. Retry-After is honored, and the final response is
+        # returned (not a RetryError) so raise_for_status reports the real status.
+        api_adapter = HTTPAdapter(
+            max_retries=Retry(
+                total=5,
+                backoff_factor=1.0,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET'],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        session.mount(self.SEARCH_API_URL, api_adapter)
+        return session
+    
     def _load_usage(self):
         """Load or initialize daily usage tracking."""
         if os.path.exists(self.usage_file):
             try:
-                with open(self.usage_file, 'r') as f:
-                    self.usage_data = json.load(f)
+                self.usage_data = read_json(self.usage_file)
             except:
                 self.usage_data = {}
         else:
@@ -83,10 +251,71 @@ class ImageSearcher:
             self._save_usage()
     
     def _save_usage(self):
-        """Save usage data."""
-        os.makedirs(os.path.dirname(self.usage_file), exist_ok=True)
-        with open(self.usage_file, 'w') as f:
-            json.dump(self.usage_data, f, indent=2)
+        """Save usage data. Only the snapshot holds _usage_lock, so searches never wait on the disk."""
+        with self._usage_write_lock:
+            with self._usage_lock:
+                buf = dumps(self.usage_data, indent=True)
+                self._usage_dirty = False
+                self._usage_updates = 0
+            
+            tmp_path = self.usage_file + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(buf)
+            os.replace(tmp_path, self.usage_file)
+    
+    def _mark_usage_dirty(self):
+        """
+        Record a usage change; the file is rewritten every USAGE_SAVE_EVERY changes.
+        The periodic write runs on the download pool so searches and the
+        coordinating loop never wait on it.
+        """
+        with self._usage_lock:
+            self._usage_dirty = True
+            self._usage_updates += 1
+            due = self._usage_updates >= self.USAGE_SAVE_EVERY
+            if due:
+                # Reset now so one threshold crossing queues only one write
+                self._usage_updates = 0
+        if due:
+            self._download_pool.submit(self._save_usage)
+    
+    def _flush_usage(self):
+        """Save usage data if it has unsaved changes."""
+        with self._usage_lock:
+            dirty = self._usage_dirty
+        if dirty:
+            self._save_usage()
+    
+    def _search_cache_path(self, query: str, num_results: int) -> Path:
+        """Cache file for a query against this search engine."""
+        key = hashlib.sha256(f"{query}|{self.search_engine_id}|{num_results}".encode('utf-8')).hexdigest()
+        return self._search_cache_dir / f"{key}.json"
+    
+    def _get_cached_search(self, cache_path: Path) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for a query, or None if missing or expired."""
+        cached = self._search_cache.get(cache_path.name)
+        if cached is not None:
+            return cached
+        
+        try:
+            if time.time() - cache_path.stat().st_mtime > self.SEARCH_CACHE_TTL_SECONDS:
+                return None
+            cached = read_json(cache_path)
+        except (OSError, ValueError):
+            return None
+        
+        self._search_cache[cache_path.name] = cached
+        return cached
+    
+    def _set_cached_search(self, cache_path: Path, results: List[Dict[str, Any]]):
+        """Store search results in memory and atomically on disk."""
+        self._search_cache[cache_path.name] = results
+        try:
+            tmp_path = cache_path.with_suffix('.tmp')
+            write_json(tmp_path, results, indent=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache search results: {e}")
     
     def _check_usage_limit(self) -> Tuple[bool, int]:
         """
@@ -109,6 +338,15 @@ class ImageSearcher:
         Returns:
             List of image results with metadata
         """
+        num_results = min(num_results, 10)  # Max 10 per request
+        
+        # Repeated queries reuse stored results without spending quota
+        cache_path = self._search_cache_path(query, num_results)
+        cached = self._get_cached_search(cache_path)
+        if cached is not None:
+            logger.info(f"Using cached results for: {query}")
+            return cached
+        
         within_limit, remaining = self._check_usage_limit()
         if not within_limit:
             raise Exception(f"Daily Google API limit reached ({self.DAILY_SEARCH_LIMIT} searches)")
@@ -120,24 +358,28 @@ class ImageSearcher:
             "cx": self.search_engine_id,
             "q": query,
             "searchType": "image",
-            "num": min(num_results, 10),  # Max 10 per request
+            "num": num_results,
             "safe": "active"  # Safe search
         }
         
+        self._rate_limiter.acquire()
+        
         try:
-            response = requests.get(self.SEARCH_API_URL, params=params, timeout=10)
+            response = self._session.get(self.SEARCH_API_URL, params=params, timeout=10)
             response.raise_for_status()
             
             # Update usage
-            self.usage_data["searches"] += 1
-            self._save_usage()
+            with self._usage_lock:
+                self.usage_data["searches"] += 1
+            self._mark_usage_dirty()
             
-            data = response.json()
+            data = loads(response.content)
             items = data.get("items", [])
             
-            # Extract relevant metadata
+            # Extract relevant metadata (the nested "image" block is flattened, not kept)
             results = []
             for item in items:
+                image = item.get("image", {})
                 result = {
                     "title": item.get("title", ""),
                     "link": item.get("link", ""),
@@ -145,18 +387,29 @@ class ImageSearcher:
                     "snippet": item.get("snippet", ""),
                     "mime": item.get("mime", ""),
                     "fileFormat": item.get("fileFormat", ""),
-                    "image": item.get("image", {}),
-                    "contextLink": item.get("image", {}).get("contextLink", ""),
-                    "thumbnailLink": item.get("image", {}).get("thumbnailLink", "")
+                    "contextLink": image.get("contextLink", ""),
+                    "thumbnailLink": image.get("thumbnailLink", "")
                 }
                 results.append(result)
             
             logger.info(f"Found {len(results)} images for query: {query}")
+            self._set_cached_search(cache_path, results)
             return results
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error searching images: {e}")
             raise
+        except ValueError as e:
+            logger.error(f"Invalid search response: {e}")
+            raise
+    
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Semaphore limiting concurrent downloads from the URL's host."""
+        host = urlparse(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.MAX_DOWNLOADS_PER_HOST))
+        return slot
     
     def download_image(self, url: str, save_path: str, timeout: int = 30) -> bool:
         """
@@ -164,28 +417,22 @@ class ImageSearcher:
         
         Args:
             url: Image URL
-            save_path: Where to save the image
+            save_path: Where to save the image (its directory must exist)
             timeout: Download timeout in seconds
             
         Returns:
             Success boolean
         """
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=timeout, stream=True)
-            response.raise_for_status()
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            
-            # Save image
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            # Cap concurrent requests per host so one CDN doesn't throttle us
+            with self._host_slot(url):
+                response = self._session.get(url, timeout=timeout, stream=True)
+                response.raise_for_status()
+                
+                # Save image, letting urllib3 undo any gzip/deflate transfer encoding
+                response.raw.decode_content = True
+                with open(save_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
             
             logger.info(f"Downloaded: {save_path}")
             return True
@@ -194,6 +441,34 @@ class ImageSearcher:
             logger.error(f"Failed to download {url}: {e}")
             return False
     
+    def _copy_download(self, source: Future, source_path: str, url: str, save_path: str) -> bool:
+        """
+        Copy an image downloaded earlier in this session instead of fetching it again.
+        
+        A copy rather than a hard link, because download_image rewrites files in
+        place and would otherwise overwrite both shots on a later re-download.
+        
+        Args:
+            source: Future of the original download
+            source_path: Where the original was saved
+            url: Image URL, fetched again if the original can't be copied
+            save_path: Where to save the copy
+            
+        Returns:
+            Success boolean
+        """
+        if not source.result():
+            return False
+        
+        try:
+            shutil.copyfile(source_path, save_path)
+            logger.info(f"Reused download: {source_path} -> {save_path}")
+            return True
+        except OSError as e:
+            # The earlier file may have been moved or deleted since; fetch it again
+            logger.warning(f"Could not reuse {source_path} ({e}); downloading again")
+            return self.download_image(url, save_path)
+    
     def get_file_extension(self, url: str, mime_type: str = None) -> str:
         """
         Determine file extension from URL or MIME type.
@@ -205,30 +480,93 @@ class ImageSearcher:
         Returns:
             File extension (e.g., '.jpg')
         """
-        # Try from URL first
-        parsed = urlparse(url)
-        path = parsed.path.lower()
-        
-        for ext in self.SUPPORTED_EXTENSIONS:
-            if path.endswith(ext):
-                return ext
-        
-        # Try from MIME type
-        if mime_type:
-            mime_map = {
-                'image/jpeg': '.jpg',
-                'image/jpg': '.jpg',
-                'image/png': '.png',
-                'image/gif': '.gif',
-                'image/webp': '.webp',
-                'image/bmp': '.bmp'
+        return _file_extension(url, mime_type)
+    
+    def _start_shot_downloads(self, shot_num: int, search_results: List[Dict[str, Any]],
+                              images_dir: str) -> List[Tuple[Dict[str, Any], str, str, Future]]:
+        """
+        Queue one shot's image downloads on the download pool without waiting.
+        
+        Args:
+            shot_num: Shot number
+            search_results: Results from search_images
+            images_dir: Directory to save images
+            
+        Returns:
+            (result, url, filename, future) for each queued download
+        """
+        started = []
+        linked = [result for result in search_results[:len(self._LETTERS)] if result.get("link")]
+        for letter, result in zip(self._LETTERS, linked):
+            url = result["link"]
+            
+            # Determine extension
+            ext = self.get_file_extension(url, result.get("mime"))
+            filename = f"{shot_num}{letter}{ext}"
+            save_path = os.path.join(images_dir, filename)
+            
+            # The same image often comes back for several shots; fetch it once
+            previous = self._downloads_by_url.get(url)
+            if previous:
+                future = self._download_pool.submit(self._copy_download, *previous, url, save_path)
+            else:
+                future = self._download_pool.submit(self.download_image, url, save_path)
+                self._downloads_by_url[url] = (future, save_path)
+            
+            started.append((result, url, filename, future))
+        
+        return started
+    
+    def _finish_shot_downloads(self, search_query: str, search_results: List[Dict[str, Any]],
+                               started: List[Tuple[Dict[str, Any], str, str, Future]],
+                               results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wait for one shot's downloads and build its metadata.
+        
+        Args:
+            search_query: Query the results came from
+            search_results: Results from search_images
+            started: Downloads queued by _start_shot_downloads
+            results: Run results; download counters are updated in place
+            
+        Returns:
+            Metadata for this shot
+        """
+        images = [
+            self._build_image_metadata(result, url, filename, future.result())
+            for result, url, filename, future in started
+        ]
+        downloaded = sum(1 for image in images if image["download_success"])
+        results["downloaded_images"] += downloaded
+        results["failed_downloads"] += len(images) - downloaded
+        
+        return {
+            "search_query": search_query,
+            "search_results": len(search_results),
+            "images": images
+        }
+    
+    @staticmethod
+    def _build_image_metadata(result: Dict[str, Any], url: str, filename: str,
+                              success: bool) -> Dict[str, Any]:
+        """Metadata for one downloaded (or failed) image."""
+        if not success:
+            return {
+                "filename": filename,
+                "url": url,
+                "download_success": False
             }
-            ext = mime_map.get(mime_type.lower())
-            if ext:
-                return ext
         
-        # Default to .jpg
-        return '.jpg'
+        return {
+            "filename": filename,
+            "url": url,
+            "title": result.get("title", ""),
+            "snippet": result.get("snippet", ""),
+            "source": result.get("displayLink", ""),
+            "context_url": result.get("contextLink", ""),
+            "mime": result.get("mime", ""),
+            "download_success": True
+        }
     
     def process_storyboard_images(self, storyboard_path: str, actor_name: str, 
                                   images_dir: str, skip_existing: bool = True) -> Dict[str, Any]:
@@ -245,8 +583,7 @@ class ImageSearcher:
             Dictionary with results and metadata
         """
         # Load storyboard
-        with open(storyboard_path, 'r') as f:
-            storyboard_data = json.load(f)
+        storyboard_data = read_json(storyboard_path)
         
         storyboard = storyboard_data.get("storyboard", [])
         total_shots = len(storyboard)
@@ -254,14 +591,12 @@ class ImageSearcher:
         # Check existing images
         existing_shots = set()
         if skip_existing and os.path.exists(images_dir):
-            for filename in os.listdir(images_dir):
-                # Extract shot number from filename like "1B.jpg"
-                if filename[:-5].endswith(('.jpg', '.png', '.gif', '.webp', '.bmp')):
-                    try:
-                        shot_num = int(filename.split('B')[0])
-                        existing_shots.add(shot_num)
-                    except:
-                        pass
+            with os.scandir(images_dir) as it:
+                for entry in it:
+                    # Extract shot number from filename like "1B.jpg"
+                    match = self._EXISTING_IMAGE_RE.match(entry.name)
+                    if match:
+                        existing_shots.add(int(match.group(1)))
         
         # Process results
         results = {
@@ -280,7 +615,8 @@ class ImageSearcher:
         if actor_name not in self.usage_data["actors"]:
             self.usage_data["actors"][actor_name] = 0
         
-        # Process each shot
+        # Collect shots that need a search
+        pending = []
         for shot in storyboard:
             shot_num = shot.get("shot")
             if not shot_num:
@@ -298,83 +634,72 @@ class ImageSearcher:
                 logger.warning(f"No search query for shot {shot_num}")
                 continue
             
-            logger.info(f"Processing shot {shot_num}/{total_shots}: {search_query}")
+            pending.append((shot_num, search_query))
+        
+        # Only submit as many uncached searches as the daily quota allows; queries
+        # already in the search cache cost nothing and always go through
+        within_limit, remaining = self._check_usage_limit()
+        budget = max(remaining, 0)
+        allowed = []
+        for shot_num, search_query in pending:
+            if self._get_cached_search(self._search_cache_path(search_query, 10)) is None:
+                if budget == 0:
+                    if not results.get("limit_reached"):
+                        logger.warning(f"Daily limit reached. Skipping uncached searches from shot {shot_num}")
+                        results["limit_reached"] = True
+                    continue
+                budget -= 1
+            allowed.append((shot_num, search_query))
+        pending = allowed
+        
+        # Create the images directory once, not per download
+        Path(images_dir).mkdir(parents=True, exist_ok=True)
+        
+        # Search in parallel and queue each shot's downloads as soon as its search
+        # completes, so searches, and downloads of different shots, all overlap
+        shot_entries = {}
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.MAX_SEARCH_WORKERS,
+                                thread_name_prefix="image-search") as search_pool:
+            futures = {
+                search_pool.submit(self.search_images, search_query): (shot_num, search_query)
+                for shot_num, search_query in pending
+            }
             
-            # Search images
-            try:
-                within_limit, remaining = self._check_usage_limit()
-                if not within_limit:
-                    logger.warning(f"Daily limit reached. Stopping at shot {shot_num}")
-                    results["limit_reached"] = True
-                    break
-                
-                search_results = self.search_images(search_query)
-                results["processed_shots"] += 1
-                
-                # Track metadata for this shot
-                shot_metadata = {
-                    "search_query": search_query,
-                    "search_results": len(search_results),
-                    "images": []
-                }
+            for future in as_completed(futures):
+                shot_num, search_query = futures[future]
+                logger.info(f"Processing shot {shot_num}/{total_shots}: {search_query}")
                 
-                # Download images (B, C, D, etc.)
-                letter_index = 1  # Start at B (A reserved for AI-generated)
-                for i, result in enumerate(search_results[:9]):  # Max 9 images (B-J)
-                    letter = chr(65 + letter_index)  # B=66, C=67, etc.
+                try:
+                    search_results = future.result()
+                    results["processed_shots"] += 1
                     
-                    url = result.get("link")
-                    if not url:
-                        continue
+                    in_flight[shot_num] = (search_query, search_results,
+                                           self._start_shot_downloads(shot_num, search_results, images_dir))
                     
-                    # Determine extension
-                    ext = self.get_file_extension(url, result.get("mime"))
-                    filename = f"{shot_num}{letter}{ext}"
-                    save_path = os.path.join(images_dir, filename)
+                    # Update actor usage
+                    with self._usage_lock:
+                        self.usage_data["actors"][actor_name] += 1
+                    self._mark_usage_dirty()
                     
-                    # Download
-                    success = self.download_image(url, save_path)
-                    
-                    if success:
-                        results["downloaded_images"] += 1
-                        # Save metadata
-                        image_metadata = {
-                            "filename": filename,
-                            "url": url,
-                            "title": result.get("title", ""),
-                            "snippet": result.get("snippet", ""),
-                            "source": result.get("displayLink", ""),
-                            "context_url": result.get("contextLink", ""),
-                            "mime": result.get("mime", ""),
-                            "download_success": True
-                        }
-                    else:
-                        results["failed_downloads"] += 1
-                        image_metadata = {
-                            "filename": filename,
-                            "url": url,
-                            "download_success": False
-                        }
-                    
-                    shot_metadata["images"].append(image_metadata)
-                    letter_index += 1
-                
-                results["shot_metadata"][str(shot_num)] = shot_metadata
-                
-                # Update actor usage
-                self.usage_data["actors"][actor_name] += 1
-                self._save_usage()
-                
-                # Small delay to be respectful
-                time.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error processing shot {shot_num}: {e}")
-                results["search_errors"] += 1
-                results["shot_metadata"][str(shot_num)] = {
-                    "status": "error",
-                    "error": str(e)
-                }
+                except Exception as e:
+                    logger.error(f"Error processing shot {shot_num}: {e}")
+                    results["search_errors"] += 1
+                    shot_entries[shot_num] = {
+                        "status": "error",
+                        "error": str(e)
+                    }
+        
+        # Collect the downloads
+        for shot_num, (search_query, search_results, started) in in_flight.items():
+            shot_entries[shot_num] = self._finish_shot_downloads(search_query, search_results, started, results)
+        
+        self._flush_usage()
+        
+        # Keep shot metadata in storyboard order
+        for shot_num, _ in pending:
+            if shot_num in shot_entries:
+                results["shot_metadata"][str(shot_num)] = shot_entries[shot_num]
         
         return results
     
@@ -6,20 +6,27 @@ Implements validation, retries, deduplication, and threading.
 
 import os
 import json
-import time
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import hashlib
 import io
+import re
 import concurrent.futures
+from functools import lru_cache
+from collections import Counter
 from datetime import datetime, date
-from typing import Dict, Any, Optional, List, Tuple, Set
+from typing import Dict, Any, Optional, List, Tuple, Set, Union, BinaryIO
 from pathlib import Path
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 from PIL import Image
 import threading
 
+from image_hashing import hamming_distance, perceptual_hash
+from json_utils import read_json, write_json
+
 # Load environment variables
 load_dotenv()
 
@@ -43,8 +50,22 @@ class EnhancedImageSearcher:
     # Max results to fetch per search (to ensure we get enough valid ones)
     MAX_SEARCH_RESULTS = 25
     
+    # Shots processed concurrently, and downloads in flight across all shots
+    SHOT_WORKERS = 4
+    MAX_DOWNLOAD_WORKERS = 12
+    
     # Supported image extensions
-    SUPPORTED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
+    SUPPORTED_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'})
+    
+    # File extension for each supported MIME type
+    _MIME_MAP = {
+        'image/jpeg': '.jpg',
+        'image/jpg': '.jpg',
+        'image/png': '.png',
+        'image/gif': '.gif',
+        'image/webp': '.webp',
+        'image/bmp': '.bmp'
+    }
     
     # Domains known for watermarks
     WATERMARKED_DOMAINS = {
@@ -58,7 +79,17 @@ class EnhancedImageSearcher:
         'pixabay.com', 'flickr.com', 'archive.org'
     }
     
-    def __init__(self, api_key: Optional[str] = None, search_engine_id: Optional[str] = None):
+    # Suffix tuples for str.endswith, which checks them all in one C-level call
+    _WATERMARK_SUFFIXES = tuple(WATERMARKED_DOMAINS)
+    _TRUSTED_SUFFIXES = tuple(TRUSTED_DOMAINS)
+    
+    # Downloaded shot images are named like "12B.jpg" (A is reserved for AI images)
+    _EXISTING_IMAGE_RE = re.compile(r'^(\d+)[B-Z]\.')
+    
+    # Max pHash Hamming distance for two images to count as the same picture
+    PHASH_DUPLICATE_DISTANCE = 6
+    
+    def __init__(self, api_key: Optional[str] = None, search_engine_id: Optional[str] = None) -> None:
         """Initialize the enhanced image searcher."""
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         self.search_engine_id = search_engine_id or os.getenv("GOOGLE_SEARCH_ENGINE_ID")
@@ -69,23 +100,61 @@ class EnhancedImageSearcher:
             raise ValueError("Search Engine ID not provided. Set GOOGLE_SEARCH_ENGINE_ID in .env file")
         
         # Initialize locks and tracking structures first
-        self.failed_domains = {}
+        self.failed_domains: Dict[str, int] = {}
         self.failed_domains_lock = threading.Lock()
-        self.image_hashes = set()
-        self.hashes_lock = threading.Lock()
+        # Content hash -> path (or source) of the image that claimed it
+        self.image_hashes: Dict[str, str] = {}
+        self.phashes: List[int] = []
+        self.failed_urls: Set[str] = set()
+        self.phashes_lock = threading.Lock()
+        self.usage_lock = threading.Lock()
+        self._usage_dirty = False
+        
+        # One pooled session shared by the search and download threads
+        self.session = self._create_session()
+        self._download_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.MAX_DOWNLOAD_WORKERS, thread_name_prefix="image-download"
+        )
         
         # Track daily usage (must be after locks are initialized)
         self.usage_file = "output/.google_api_usage.json"
+        self.usage_data: Dict[str, Any] = {}
         self._load_usage()
         
         logger.info("Successfully initialized Enhanced Google Image Searcher")
     
-    def _load_usage(self):
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session sized for the concurrent download workers."""
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Referer': 'https://google.com/'
+        })
+        # pool_connections is how many hosts keep a pool; one shot's results span
+        # many image hosts, so keep enough that pools aren't evicted between shots
+        adapter = HTTPAdapter(
+            pool_connections=64,
+            pool_maxsize=64,
+            pool_block=False,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def close(self) -> None:
+        """Save pending usage, stop the download workers and close the pooled HTTP connections."""
+        self._flush_usage()
+        self._download_pool.shutdown(wait=True)
+        self.session.close()
+    
+    def _load_usage(self) -> None:
         """Load or initialize daily usage tracking."""
         if os.path.exists(self.usage_file):
             try:
-                with open(self.usage_file, 'r') as f:
-                    self.usage_data = json.load(f)
+                self.usage_data = read_json(self.usage_file)
             except:
                 self.usage_data = {}
         else:
@@ -102,7 +171,7 @@ class EnhancedImageSearcher:
             }
             self._save_usage()
     
-    def _save_usage(self):
+    def _save_usage(self) -> None:
         """Save usage data."""
         os.makedirs(os.path.dirname(self.usage_file), exist_ok=True)
         
@@ -110,11 +179,18 @@ class EnhancedImageSearcher:
         with self.failed_domains_lock:
             self.usage_data["failed_domains"] = dict(self.failed_domains)
         
-        with open(self.usage_file, 'w') as f:
-            json.dump(self.usage_data, f, indent=2)
+        write_json(self.usage_file, self.usage_data)
+        self._usage_dirty = False
+    
+    def _flush_usage(self) -> None:
+        """Save usage data if searches were counted since the last save."""
+        with self.usage_lock:
+            if self._usage_dirty:
+                self._save_usage()
     
     def get_usage_summary(self) -> Dict[str, Any]:
         """Get current API usage summary."""
+        self._flush_usage()  # Don't let the refresh drop unsaved searches
         self._load_usage()  # Refresh data
         return {
             "searches_today": self.usage_data.get("searches", 0),
@@ -124,25 +200,27 @@ class EnhancedImageSearcher:
             "actors_searched": list(self.usage_data.get("actors", {}).keys())
         }
     
-    def _track_failed_domain(self, domain: str):
+    def _track_failed_domain(self, domain: str) -> None:
         """Track domains that fail frequently."""
         with self.failed_domains_lock:
             if domain not in self.failed_domains:
                 self.failed_domains[domain] = 0
             self.failed_domains[domain] += 1
     
+    def _track_failed_url(self, url: str, domain: str) -> None:
+        """Remember a failed URL so it isn't downloaded again, and count its domain failure."""
+        self.failed_urls.add(url)
+        self._track_failed_domain(domain)
+    
     def _get_domain_score(self, url: str) -> int:
         """Score a domain based on reliability and watermark likelihood."""
         try:
             domain = urlparse(url).netloc.lower()
             
-            # Check if it's a known watermarked domain
-            if any(wd in domain for wd in self.WATERMARKED_DOMAINS):
-                return -10
-            
-            # Check if it's a trusted domain
-            if any(td in domain for td in self.TRUSTED_DOMAINS):
-                return 10
+            # Known watermarked or trusted domains
+            score = self._score_netloc(domain)
+            if score:
+                return score
             
             # Check failure history
             failures = self.failed_domains.get(domain, 0)
@@ -155,6 +233,17 @@ class EnhancedImageSearcher:
         except:
             return 0
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _score_netloc(domain: str) -> int:
+        """Score a lowercased hostname by the fixed domain lists (-10 watermarked, 10 trusted, 0 neither)."""
+        host = domain.partition(':')[0]
+        if host.endswith(EnhancedImageSearcher._WATERMARK_SUFFIXES):
+            return -10
+        if host.endswith(EnhancedImageSearcher._TRUSTED_SUFFIXES):
+            return 10
+        return 0
+    
     def search_images_extended(self, query: str) -> List[Dict[str, Any]]:
         """
         Search for more images using pagination to get up to MAX_SEARCH_RESULTS.
@@ -165,24 +254,34 @@ class EnhancedImageSearcher:
         Returns:
             List of image results with metadata
         """
-        all_results = []
-        start_index = 1
+        # Google Custom Search returns max 10 results per request; the pages don't
+        # overlap, so all of them can be requested at once
+        pages = [
+            (start, min(10, self.MAX_SEARCH_RESULTS - start + 1))
+            for start in range(1, self.MAX_SEARCH_RESULTS + 1, 10)
+        ]
         
-        # Google Custom Search returns max 10 results per request
-        while len(all_results) < self.MAX_SEARCH_RESULTS:
-            remaining = self.MAX_SEARCH_RESULTS - len(all_results)
-            num_to_fetch = min(10, remaining)
-            
-            results = self.search_images(query, num_results=num_to_fetch, start_index=start_index)
-            if not results:
-                break
-            
-            all_results.extend(results)
-            start_index += len(results)
-            
-            # Small delay between requests
-            time.sleep(0.5)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            futures = [
+                executor.submit(self.search_images, query, num_results=num, start_index=start)
+                for start, num in pages
+            ]
+            all_results = []
+            errors = []
+            for future in futures:
+                try:
+                    all_results.extend(future.result())
+                except Exception as e:
+                    errors.append(e)
         
+        # Keep the pages that came back (near the end of the quota only some
+        # pages get a slot); fail only when nothing did
+        if errors:
+            if not all_results:
+                raise errors[0]
+            logger.warning(f"{len(errors)} of {len(pages)} result pages failed for query: {query}")
+        
+        all_results.sort(key=lambda x: x['domain_score'], reverse=True)
         return all_results
     
     def search_images(self, query: str, num_results: int = 10, start_index: int = 1) -> List[Dict[str, Any]]:
@@ -197,8 +296,9 @@ class EnhancedImageSearcher:
         Returns:
             List of image results with metadata
         """
-        within_limit, remaining = self._check_usage_limit()
-        if not within_limit:
+        # Claim the quota slot up front so concurrent searches can't overshoot it
+        remaining = self._reserve_search()
+        if remaining is None:
             raise Exception(f"Daily Google API limit reached ({self.DAILY_SEARCH_LIMIT} searches)")
         
         logger.info(f"Searching images for: {query} (start: {start_index}, remaining quota: {remaining})")
@@ -214,13 +314,15 @@ class EnhancedImageSearcher:
         }
         
         try:
-            response = requests.get(self.SEARCH_API_URL, params=params, timeout=10)
+            response = self.session.get(self.SEARCH_API_URL, params=params, timeout=10)
             response.raise_for_status()
-            
-            # Update usage
-            self.usage_data["searches"] += 1
-            self._save_usage()
-            
+        except requests.exceptions.RequestException as e:
+            # Failed searches don't count against the quota
+            self._release_search()
+            logger.error(f"Error searching images: {e}")
+            raise
+        
+        try:
             data = response.json()
             items = data.get("items", [])
             
@@ -254,12 +356,34 @@ class EnhancedImageSearcher:
             logger.error(f"Error searching images: {e}")
             raise
     
+    def _reserve_search(self) -> Optional[int]:
+        """
+        Atomically count one search against today's quota.
+        
+        Returns:
+            Searches remaining before this one, or None if the limit is reached
+        """
+        with self.usage_lock:
+            searches = self.usage_data.get("searches", 0)
+            if searches >= self.DAILY_SEARCH_LIMIT:
+                return None
+            self.usage_data["searches"] = searches + 1
+            self._usage_dirty = True
+            return self.DAILY_SEARCH_LIMIT - searches
+    
+    def _release_search(self) -> None:
+        """Return a reserved search to the quota after the request failed."""
+        with self.usage_lock:
+            self.usage_data["searches"] -= 1
+            self._usage_dirty = True
+    
     def _check_usage_limit(self) -> Tuple[bool, int]:
         """Check if we're within daily usage limit."""
         remaining = self.DAILY_SEARCH_LIMIT - self.usage_data.get("searches", 0)
         return remaining > 0, remaining
     
-    def validate_and_download_image(self, url: str, save_path: str, max_size_mb: int = 20) -> Dict[str, Any]:
+    def validate_and_download_image(self, url: str, save_path: str, max_size_mb: int = 20,
+                                    thumb_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Download and validate image with quality controls.
         
@@ -267,103 +391,112 @@ class EnhancedImageSearcher:
             url: Image URL
             save_path: Where to save the image
             max_size_mb: Maximum file size in MB
+            thumb_path: Where to save the thumbnail (defaults to a thumbnails/ folder next to the image)
             
         Returns:
             Dictionary with download result and metadata
         """
+        # Don't spend another download on a URL that already failed this run
+        if url in self.failed_urls:
+            return {"success": False, "error": "URL failed earlier"}
+        
         try:
             domain = urlparse(url).netloc
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Referer': 'https://google.com/'
-            }
-            
-            # First, try HEAD request to check size
-            try:
-                head_response = requests.head(url, headers=headers, timeout=5, allow_redirects=True)
-                content_length = head_response.headers.get('content-length')
-                
-                if content_length:
-                    size_mb = int(content_length) / (1024 * 1024)
-                    if size_mb > max_size_mb:
-                        self._track_failed_domain(domain)
-                        return {"success": False, "error": f"Image too large: {size_mb:.1f}MB"}
-            except:
-                # If HEAD fails, continue with GET
-                pass
-            
             # Download image with shorter timeout and retries
             max_retries = 2
             for attempt in range(max_retries):
                 try:
-                    response = requests.get(url, headers=headers, timeout=15, stream=True)
+                    response = self.session.get(url, timeout=15, stream=True)
                     response.raise_for_status()
                     break
                 except requests.Timeout:
                     if attempt == max_retries - 1:
-                        self._track_failed_domain(domain)
+                        self._track_failed_url(url, domain)
                         return {"success": False, "error": "Download timeout"}
                     continue
                 except Exception as e:
                     if attempt == max_retries - 1:
                         raise
             
-            # Check if it's actually an image
-            content_type = response.headers.get('content-type', '')
-            if not content_type.startswith('image/'):
-                self._track_failed_domain(domain)
-                return {"success": False, "error": f"Not an image: {content_type}"}
-            
-            # Load into memory for validation
-            image_data = io.BytesIO()
-            downloaded_size = 0
-            
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    downloaded_size += len(chunk)
-                    if downloaded_size > max_size_mb * 1024 * 1024:
-                        self._track_failed_domain(domain)
-                        return {"success": False, "error": "Download exceeded size limit"}
-                    image_data.write(chunk)
-            
-            image_data.seek(0)
+            # Closing the response returns its connection to the pool on every exit
+            with response:
+                # Check if it's actually an image
+                content_type = response.headers.get('content-type', '')
+                if not content_type.startswith('image/'):
+                    self._track_failed_url(url, domain)
+                    return {"success": False, "error": f"Not an image: {content_type}"}
+                
+                # Reject oversized images from the declared length before reading the body
+                try:
+                    content_length = int(response.headers.get('content-length', 0))
+                except ValueError:
+                    content_length = 0
+                if content_length > max_size_mb * 1024 * 1024:
+                    self._track_failed_url(url, domain)
+                    return {"success": False, "error": f"Image too large: {content_length / (1024 * 1024):.1f}MB"}
+                
+                # Load into memory for validation, fingerprinting as the bytes arrive.
+                # The buffer is allocated once from the declared length; slice assignment
+                # past the end still appends if the body turns out longer (or the length is unknown).
+                buffer = bytearray(content_length)
+                hasher = hashlib.blake2b(digest_size=16)
+                downloaded_size = 0
+                
+                for chunk in response.iter_content(chunk_size=8192):
+                    if chunk:
+                        end = downloaded_size + len(chunk)
+                        if end > max_size_mb * 1024 * 1024:
+                            self._track_failed_url(url, domain)
+                            return {"success": False, "error": "Download exceeded size limit"}
+                        buffer[downloaded_size:end] = chunk
+                        hasher.update(chunk)
+                        downloaded_size = end
+            
+            # Drop unused space if the body was shorter than declared
+            del buffer[downloaded_size:]
+            image_data = io.BytesIO(buffer)
+            
+            # Claim the content hash before paying for a decode. dict.setdefault is
+            # atomic under the GIL, so exactly one worker wins identical bytes.
+            image_hash = hasher.hexdigest()
+            if self.image_hashes.setdefault(image_hash, save_path) != save_path:
+                return {"success": False, "error": "Duplicate image", "hash": image_hash}
             
             # Validate it's a real image
             try:
                 img = Image.open(image_data)
-                img.verify()  # Verify it's not corrupted
-                
-                # Re-open for getting info
-                image_data.seek(0)
-                img = Image.open(image_data)
                 
-                # Get image properties
+                # Get image properties from the header, before draft mode shrinks the size
                 width, height = img.size
                 aspect_ratio = width / height
                 
-                # Calculate hash for deduplication
-                image_data.seek(0)
-                image_hash = hashlib.md5(image_data.read()).hexdigest()
+                # Decode once; a corrupt or truncated file raises here. JPEGs are
+                # decoded at reduced scale since only hashes and thumbnails need pixels.
+                img.draft('RGB', (640, 360))
+                img.load()
+                
+                phash = perceptual_hash(img)
                 
-                # Check if duplicate
-                with self.hashes_lock:
-                    if image_hash in self.image_hashes:
-                        return {"success": False, "error": "Duplicate image", "hash": image_hash}
-                    self.image_hashes.add(image_hash)
+                # Reject re-encoded or resized copies; the scan and append must be
+                # one step, so this part keeps a lock
+                with self.phashes_lock:
+                    if any(hamming_distance(phash, existing) <= self.PHASH_DUPLICATE_DISTANCE
+                           for existing in self.phashes):
+                        self._release_hash(image_hash, save_path)
+                        return {"success": False, "error": "Near-duplicate image", "hash": image_hash}
+                    self.phashes.append(phash)
                 
                 # Save the validated image
                 os.makedirs(os.path.dirname(save_path), exist_ok=True)
-                image_data.seek(0)
                 with open(save_path, 'wb') as f:
-                    f.write(image_data.read())
+                    f.write(buffer)
                 
-                # Generate thumbnail
-                thumb_dir = os.path.join(os.path.dirname(save_path), "thumbnails")
-                thumb_path = os.path.join(thumb_dir, os.path.basename(save_path))
-                self.generate_thumbnail(save_path, thumb_path)
+                # Generate thumbnail from the already decoded image
+                if thumb_path is None:
+                    thumb_dir = os.path.join(os.path.dirname(save_path), "thumbnails")
+                    thumb_path = os.path.join(thumb_dir, os.path.basename(save_path))
+                self._write_thumbnail_from_img(img, thumb_path)
                 
                 return {
                     "success": True,
@@ -373,47 +506,68 @@ class EnhancedImageSearcher:
                     "format": img.format,
                     "mode": img.mode,
                     "hash": image_hash,
+                    "phash": f"{phash:016x}",
                     "size_bytes": downloaded_size,
                     "size_mb": downloaded_size / (1024 * 1024),
                     "domain": domain
                 }
                 
             except Exception as e:
-                self._track_failed_domain(domain)
+                self._release_hash(image_hash, save_path)
+                self._track_failed_url(url, domain)
                 return {"success": False, "error": f"Invalid image: {str(e)}"}
                 
         except Exception as e:
             if 'domain' in locals():
-                self._track_failed_domain(domain)
+                self._track_failed_url(url, domain)
             return {"success": False, "error": str(e)}
     
-    def generate_thumbnail(self, image_path: str, thumb_path: str, size: tuple = (320, 180)):
-        """Generate thumbnail for quick preview."""
+    def _release_hash(self, image_hash: str, save_path: str) -> None:
+        """Drop a content-hash claim made for save_path, unless another worker now owns it."""
+        if self.image_hashes.get(image_hash) == save_path:
+            self.image_hashes.pop(image_hash, None)
+    
+    def generate_thumbnail(self, image_path: Union[str, BinaryIO], thumb_path: str,
+                           size: Tuple[int, int] = (320, 180)) -> bool:
+        """Generate thumbnail for quick preview from an image path or an in-memory file."""
+        try:
+            with Image.open(image_path) as img:
+                # Let JPEGs decode at reduced scale; the thumbnail is far smaller
+                img.draft('RGB', (size[0] * 2, size[1] * 2))
+                return self._write_thumbnail_from_img(img, thumb_path, size)
+        except Exception as e:
+            logger.error(f"Failed to generate thumbnail: {e}")
+            return False
+    
+    def _write_thumbnail_from_img(self, img: Image.Image, thumb_path: str,
+                                  size: Tuple[int, int] = (320, 180)) -> bool:
+        """Write a thumbnail for an already opened image, leaving the image itself unchanged."""
         try:
             os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
             
-            with Image.open(image_path) as img:
-                # Convert to RGB if necessary
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'RGBA' or img.mode == 'LA':
-                        rgb_img.paste(img, mask=img.split()[-1])
-                    else:
-                        rgb_img.paste(img)
-                    img = rgb_img
-                
-                # Create thumbnail maintaining aspect ratio
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-                
-                # Save with optimization
-                img.save(thumb_path, 'JPEG', quality=85, optimize=True)
-                
-                return True
+            # Convert to RGB if necessary
+            if img.mode in ('RGBA', 'LA', 'P'):
+                thumb = Image.new('RGB', img.size, (255, 255, 255))
+                if img.mode == 'RGBA' or img.mode == 'LA':
+                    thumb.paste(img, mask=img.split()[-1])
+                else:
+                    thumb.paste(img)
+            else:
+                thumb = img.copy()
+            
+            # Create thumbnail maintaining aspect ratio; at preview size bilinear
+            # is indistinguishable from Lanczos and much cheaper
+            thumb.thumbnail(size, Image.Resampling.BILINEAR)
+            
+            # Save with optimization
+            thumb.save(thumb_path, 'JPEG', quality=85, optimize=True)
+            
+            return True
         except Exception as e:
             logger.error(f"Failed to generate thumbnail: {e}")
             return False
     
-    def download_images_for_shot(self, shot_num: int, search_results: List[Dict], 
+    def download_images_for_shot(self, shot_num: int, search_results: List[Dict[str, Any]], 
                                 images_dir: str) -> Dict[str, Any]:
         """
         Download images for a single shot using threading.
@@ -426,7 +580,7 @@ class EnhancedImageSearcher:
         Returns:
             Dictionary with download results
         """
-        shot_result = {
+        shot_result: Dict[str, Any] = {
             "shot_num": shot_num,
             "total_results": len(search_results),
             "download_attempts": 0,
@@ -435,98 +589,124 @@ class EnhancedImageSearcher:
             "images": []
         }
         
-        # Use ThreadPoolExecutor for parallel downloads
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = []
-            letter_index = 1  # Start at B (A reserved for AI)
+        # Downloads go to the shared pool, so shots being processed concurrently
+        # draw from one set of worker threads
+        futures = []
+        letter_index = 1  # Start at B (A reserved for AI)
+        
+        for result in search_results:
+            if shot_result["successful_downloads"] >= self.IMAGES_PER_SHOT:
+                break
             
-            for result in search_results:
-                if shot_result["successful_downloads"] >= self.IMAGES_PER_SHOT:
-                    break
-                
-                url = result.get("link")
-                if not url:
-                    continue
-                
-                # Determine filename
-                ext = self.get_file_extension(url, result.get("mime"))
-                letter = chr(65 + letter_index)
-                filename = f"{shot_num}{letter}{ext}"
-                save_path = os.path.join(images_dir, filename)
-                
-                # Submit download task
-                future = executor.submit(
-                    self.validate_and_download_image,
-                    url, save_path
-                )
-                futures.append((future, result, filename, letter_index))
-                letter_index += 1
-                shot_result["download_attempts"] += 1
+            url = result.get("link")
+            if not url:
+                continue
             
-            # Process results as they complete
-            for future, result, filename, idx in futures:
-                try:
-                    download_result = future.result(timeout=60)
-                    
-                    if download_result["success"]:
-                        shot_result["successful_downloads"] += 1
-                        image_metadata = {
-                            "filename": filename,
-                            "url": result.get("link"),
-                            "title": result.get("title", ""),
-                            "snippet": result.get("snippet", ""),
-                            "source": result.get("displayLink", ""),
-                            "context_url": result.get("contextLink", ""),
-                            "width": download_result.get("width"),
-                            "height": download_result.get("height"),
-                            "aspect_ratio": download_result.get("aspect_ratio"),
-                            "size_mb": download_result.get("size_mb"),
-                            "format": download_result.get("format"),
-                            "hash": download_result.get("hash"),
-                            "domain_score": result.get("domain_score", 0)
-                        }
-                        shot_result["images"].append(image_metadata)
-                    else:
-                        shot_result["failed_downloads"] += 1
-                        logger.debug(f"Failed to download {filename}: {download_result.get('error')}")
-                        
-                except concurrent.futures.TimeoutError:
-                    shot_result["failed_downloads"] += 1
-                    logger.error(f"Download timeout (60s) for {filename} from {result.get('link', 'unknown URL')}")
-                except Exception as e:
-                    shot_result["failed_downloads"] += 1
-                    error_msg = str(e) if str(e) else repr(e)
-                    logger.error(f"Download error for {filename}: {type(e).__name__}: {error_msg}")
+            # Determine filename
+            ext = self.get_file_extension(url, result.get("mime"))
+            letter = chr(65 + letter_index)
+            filename = f"{shot_num}{letter}{ext}"
+            save_path = os.path.join(images_dir, filename)
+            
+            # Submit download task
+            future = self._download_pool.submit(
+                self.validate_and_download_image,
+                url, save_path
+            )
+            futures.append((future, result, filename, letter_index))
+            letter_index += 1
+            shot_result["download_attempts"] += 1
+        
+        # Wait for every job without a wall-clock limit: queue time on the shared
+        # pool is not download time, and each request carries its own timeouts
+        completed = {}
+        for future in concurrent.futures.as_completed([f for f, _, _, _ in futures]):
+            try:
+                completed[future] = future.result()
+            except Exception as e:
+                completed[future] = e
+        
+        # Record results in letter order
+        for future, result, filename, idx in futures:
+            download_result = completed[future]
+            if isinstance(download_result, Exception):
+                shot_result["failed_downloads"] += 1
+                error_msg = str(download_result) if str(download_result) else repr(download_result)
+                logger.error(f"Download error for {filename}: {type(download_result).__name__}: {error_msg}")
+                continue
+            
+            if download_result["success"]:
+                shot_result["successful_downloads"] += 1
+                image_metadata = {
+                    "filename": filename,
+                    "url": result.get("link"),
+                    "title": result.get("title", ""),
+                    "snippet": result.get("snippet", ""),
+                    "source": result.get("displayLink", ""),
+                    "context_url": result.get("contextLink", ""),
+                    "width": download_result.get("width"),
+                    "height": download_result.get("height"),
+                    "aspect_ratio": download_result.get("aspect_ratio"),
+                    "size_mb": download_result.get("size_mb"),
+                    "format": download_result.get("format"),
+                    "hash": download_result.get("hash"),
+                    "phash": download_result.get("phash"),
+                    "domain_score": result.get("domain_score", 0)
+                }
+                shot_result["images"].append(image_metadata)
+            else:
+                shot_result["failed_downloads"] += 1
+                logger.debug(f"Failed to download {filename}: {download_result.get('error')}")
         
         return shot_result
     
-    def get_file_extension(self, url: str, mime_type: str = None) -> str:
+    def get_file_extension(self, url: str, mime_type: Optional[str] = None) -> str:
         """Determine file extension from URL or MIME type."""
         # Try from URL first
-        parsed = urlparse(url)
-        path = parsed.path.lower()
-        
-        for ext in self.SUPPORTED_EXTENSIONS:
-            if path.endswith(ext):
-                return ext
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        if ext in self.SUPPORTED_EXTENSIONS:
+            return ext
         
         # Try from MIME type
         if mime_type:
-            mime_map = {
-                'image/jpeg': '.jpg',
-                'image/jpg': '.jpg',
-                'image/png': '.png',
-                'image/gif': '.gif',
-                'image/webp': '.webp',
-                'image/bmp': '.bmp'
-            }
-            ext = mime_map.get(mime_type.lower())
-            if ext:
-                return ext
+            mime_ext = self._MIME_MAP.get(mime_type.lower())
+            if mime_ext:
+                return mime_ext
         
         # Default to .jpg
         return '.jpg'
     
+    def _process_single_shot(self, shot_num: int, search_query: str, images_dir: str,
+                             total_shots: int) -> Dict[str, Any]:
+        """
+        Search and download the images for one shot.
+        
+        Args:
+            shot_num: Shot number
+            search_query: Search query for this shot
+            images_dir: Directory to save images
+            total_shots: Number of shots in the storyboard, for logging
+            
+        Returns:
+            Shot metadata with download counts and image details
+        """
+        logger.info(f"Processing shot {shot_num}/{total_shots}: {search_query}")
+        
+        # Search for extended results
+        search_results = self.search_images_extended(search_query)
+        
+        # Download images for this shot
+        shot_result = self.download_images_for_shot(shot_num, search_results, images_dir)
+        
+        return {
+            "search_query": search_query,
+            "search_results_count": len(search_results),
+            "download_attempts": shot_result["download_attempts"],
+            "successful_downloads": shot_result["successful_downloads"],
+            "failed_downloads": shot_result["failed_downloads"],
+            "images": shot_result["images"]
+        }
+    
     def process_storyboard_images(self, storyboard_path: str, actor_name: str, 
                                   images_dir: str, skip_existing: bool = True) -> Dict[str, Any]:
         """
@@ -543,7 +723,9 @@ class EnhancedImageSearcher:
                     for shot_data in existing_data.get("shot_metadata", {}).values():
                         for img in shot_data.get("images", []):
                             if img.get("hash"):
-                                self.image_hashes.add(img["hash"])
+                                self.image_hashes[img["hash"]] = img.get("filename", "")
+                            if img.get("phash"):
+                                self.phashes.append(int(img["phash"], 16))
             except:
                 pass
         
@@ -555,7 +737,7 @@ class EnhancedImageSearcher:
         total_shots = len(storyboard)
         
         # Process results
-        results = {
+        results: Dict[str, Any] = {
             "actor_name": actor_name,
             "total_shots": total_shots,
             "processed_shots": 0,
@@ -569,7 +751,20 @@ class EnhancedImageSearcher:
             "domain_statistics": {}
         }
         
-        # Process each shot
+        # Queue each shot that still needs images, stopping once the searches
+        # already committed to queued shots would use up the daily quota
+        searches_per_shot = -(-self.MAX_SEARCH_RESULTS // 10)
+        pending: List[Tuple[int, str]] = []
+        
+        # Count existing images per shot with one directory scan
+        existing_counts: Counter = Counter()
+        if skip_existing and os.path.isdir(images_dir):
+            with os.scandir(images_dir) as it:
+                for entry in it:
+                    match = self._EXISTING_IMAGE_RE.match(entry.name)
+                    if match:
+                        existing_counts[match.group(1)] += 1
+        
         for shot in storyboard:
             shot_num = shot.get("shot")
             if not shot_num:
@@ -577,12 +772,7 @@ class EnhancedImageSearcher:
             
             # Check if we already have enough images for this shot
             if skip_existing:
-                existing_count = 0
-                shot_pattern = f"{shot_num}[B-Z]"
-                if os.path.exists(images_dir):
-                    import glob
-                    existing_files = glob.glob(os.path.join(images_dir, f"{shot_num}[B-Z].*"))
-                    existing_count = len(existing_files)
+                existing_count = existing_counts[str(shot_num)]
                 
                 if existing_count >= self.IMAGES_PER_SHOT:
                     logger.info(f"Skipping shot {shot_num} - already has {existing_count} images")
@@ -596,47 +786,47 @@ class EnhancedImageSearcher:
                 logger.warning(f"No search query for shot {shot_num}")
                 continue
             
-            logger.info(f"Processing shot {shot_num}/{total_shots}: {search_query}")
-            
-            try:
-                # Check API limit
+            with self.usage_lock:
                 within_limit, remaining = self._check_usage_limit()
-                if not within_limit:
-                    logger.warning(f"Daily limit reached. Stopping at shot {shot_num}")
-                    results["limit_reached"] = True
-                    break
-                
-                # Search for extended results
-                search_results = self.search_images_extended(search_query)
-                results["processed_shots"] += 1
-                
-                # Download images for this shot
-                shot_result = self.download_images_for_shot(shot_num, search_results, images_dir)
+            if not within_limit or remaining <= len(pending) * searches_per_shot:
+                logger.warning(f"Daily limit reached. Stopping at shot {shot_num}")
+                results["limit_reached"] = True
+                break
+            
+            pending.append((shot_num, search_query))
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.SHOT_WORKERS) as executor:
+            futures = {
+                executor.submit(self._process_single_shot, shot_num, search_query, images_dir, total_shots): shot_num
+                for shot_num, search_query in pending
+            }
+            
+            for future in concurrent.futures.as_completed(futures):
+                shot_num = futures[future]
+                self._flush_usage()
+                try:
+                    shot_metadata = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing shot {shot_num}: {e}")
+                    results["search_errors"] += 1
+                    results["shot_metadata"][str(shot_num)] = {
+                        "status": "error",
+                        "error": str(e)
+                    }
+                    continue
                 
                 # Update totals
-                results["total_downloads"] += shot_result["download_attempts"]
-                results["successful_downloads"] += shot_result["successful_downloads"]
-                results["failed_downloads"] += shot_result["failed_downloads"]
-                
-                # Store shot metadata
-                results["shot_metadata"][str(shot_num)] = {
-                    "search_query": search_query,
-                    "search_results_count": len(search_results),
-                    "download_attempts": shot_result["download_attempts"],
-                    "successful_downloads": shot_result["successful_downloads"],
-                    "images": shot_result["images"]
-                }
-                
-                # Small delay between shots
-                time.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error processing shot {shot_num}: {e}")
-                results["search_errors"] += 1
-                results["shot_metadata"][str(shot_num)] = {
-                    "status": "error",
-                    "error": str(e)
-                }
+                results["processed_shots"] += 1
+                results["total_downloads"] += shot_metadata["download_attempts"]
+                results["successful_downloads"] += shot_metadata["successful_downloads"]
+                results["failed_downloads"] += shot_metadata["failed_downloads"]
+                results["shot_metadata"][str(shot_num)] = shot_metadata
+        
+        # Shots finish out of order; keep the metadata in storyboard order
+        shot_order = {str(shot.get("shot")): index for index, shot in enumerate(storyboard)}
+        results["shot_metadata"] = dict(
+            sorted(results["shot_metadata"].items(), key=lambda item: shot_order.get(item[0], 0))
+        )
         
         # Calculate domain statistics
         with self.failed_domains_lock:
@@ -5,20 +5,28 @@ IMPROVED VERSION: Only makes additional API calls if needed.
 """
 
 import os
+import re
 import sys
+import atexit
 import json
-import time
 import hashlib
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import threading
 import concurrent.futures
+from collections import Counter
+from functools import lru_cache
 from datetime import datetime, date
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 from urllib.parse import urlparse, parse_qs
 import io
 from PIL import Image
 
+from image_hashing import BKTree, perceptual_hash
+from json_utils import read_json, write_json
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -40,9 +48,30 @@ class EnhancedImageSearcher:
     # Minimum acceptable images per shot (will retry if below this)
     MIN_IMAGES_PER_SHOT = 3
     
+    # Seconds between background writes of the usage file
+    USAGE_FLUSH_INTERVAL_SECONDS = 10
+    
+    # Concurrent image downloads overall, and per image host
+    MAX_DOWNLOAD_WORKERS = 16
+    MAX_DOWNLOADS_PER_HOST = 3
+    
     # Supported image extensions
     SUPPORTED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
     
+    # Supported extension at the end of a URL path, and the extension for each MIME type
+    _EXTENSION_RE = re.compile(r'\.(jpg|jpeg|png|gif|webp|bmp)$', re.IGNORECASE)
+    _MIME_MAP = {
+        'image/jpeg': '.jpg',
+        'image/jpg': '.jpg',
+        'image/png': '.png',
+        'image/gif': '.gif',
+        'image/webp': '.webp',
+        'image/bmp': '.bmp'
+    }
+    
+    # Downloaded image filenames: shot number, letter B-Z (A is the AI image), extension
+    _EXISTING_IMAGE_RE = re.compile(r'^(\d+)[B-Z]\.')
+    
     # Domains known for watermarks
     WATERMARKED_DOMAINS = {
         'gettyimages.com', 'shutterstock.com', 'alamy.com', 'istockphoto.com',
@@ -55,6 +84,16 @@ class EnhancedImageSearcher:
         'pixabay.com', 'flickr.com', 'archive.org'
     }
     
+    # Frozen copies for hostname lookups
+    _WATERMARKED_HOSTS = frozenset(WATERMARKED_DOMAINS)
+    _TRUSTED_HOSTS = frozenset(TRUSTED_DOMAINS)
+    
+    # Max pHash Hamming distance for two images to count as the same picture
+    PHASH_DUPLICATE_DISTANCE = 2
+    
+    # Modes Image.reduce() averages correctly (not palette, bilevel or 16-bit)
+    _REDUCIBLE_MODES = frozenset({'L', 'LA', 'RGB', 'RGBA', 'RGBX', 'CMYK', 'YCbCr', 'I', 'F'})
+    
     def __init__(self, api_key: Optional[str] = None, search_engine_id: Optional[str] = None):
         """Initialize the enhanced image searcher."""
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
@@ -69,20 +108,73 @@ class EnhancedImageSearcher:
         self.failed_domains = {}
         self.failed_domains_lock = threading.Lock()
         self.image_hashes = set()
+        self.phash_index = BKTree()
+        # Normalized image URLs already tried (only touched by the coordinating thread)
+        self.seen_urls: Set[str] = set()
         self.hashes_lock = threading.Lock()
         
-        # Track daily usage (must be after locks are initialized)
+        # One pooled session shared by the search and download threads
+        self.session = self._create_session()
+        
+        # One long-lived download pool; its size is the global concurrency cap
+        self._download_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.MAX_DOWNLOAD_WORKERS, thread_name_prefix="image-download"
+        )
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        # Fetches the next result page while the current page downloads
+        self._search_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="image-search"
+        )
+        
+        # Track daily usage (must be after locks are initialized). The counts live
+        # in memory; a background timer and exit hook write them to disk.
         self.usage_file = "output/.google_api_usage.json"
+        self.usage_lock = threading.Lock()
+        self._usage_dirty = False
         self._load_usage()
+        self._usage_timer: Optional[threading.Timer] = None
+        self._schedule_usage_flush()
+        atexit.register(self._flush_usage)
         
         logger.info("Successfully initialized Enhanced Google Image Searcher (v2)")
     
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session that retries transient server errors."""
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def close(self):
+        """Stop the download workers, save usage and close the pooled HTTP connections."""
+        self._search_pool.shutdown(wait=True)
+        self._download_pool.shutdown(wait=True)
+        if self._usage_timer is not None:
+            self._usage_timer.cancel()
+            self._usage_timer = None
+        self._flush_usage()
+        self.session.close()
+    
+    def _host_slot(self, domain: str) -> threading.BoundedSemaphore:
+        """Semaphore limiting concurrent downloads from one host."""
+        slot = self._host_slots.get(domain)
+        if slot is None:
+            slot = self._host_slots.setdefault(domain, threading.BoundedSemaphore(self.MAX_DOWNLOADS_PER_HOST))
+        return slot
+    
     def _load_usage(self):
         """Load or initialize daily usage tracking."""
         if os.path.exists(self.usage_file):
             try:
-                with open(self.usage_file, 'r') as f:
-                    self.usage_data = json.load(f)
+                self.usage_data = read_json(self.usage_file)
             except:
                 self.usage_data = {}
         else:
@@ -100,19 +192,55 @@ class EnhancedImageSearcher:
             self._save_usage()
     
     def _save_usage(self):
-        """Save usage data."""
+        """Save usage data (atomically, since the flush timer may write it)."""
         os.makedirs(os.path.dirname(self.usage_file), exist_ok=True)
         
         # Update failed domains in usage data
         with self.failed_domains_lock:
             self.usage_data["failed_domains"] = dict(self.failed_domains)
         
-        with open(self.usage_file, 'w') as f:
-            json.dump(self.usage_data, f, indent=2)
+        tmp_path = self.usage_file + '.tmp'
+        write_json(tmp_path, self.usage_data)
+        os.replace(tmp_path, self.usage_file)
+        self._usage_dirty = False
+    
+    def _flush_usage(self, force: bool = False):
+        """
+        Write usage data if it changed, starting a fresh count if the day rolled over.
+        
+        Args:
+            force: Write even without new searches (e.g. to record failed domains)
+        """
+        with self.usage_lock:
+            today = date.today().isoformat()
+            if self.usage_data.get("date") != today:
+                self.usage_data = {
+                    "date": today,
+                    "searches": 0,
+                    "actors": {},
+                    "failed_domains": {}
+                }
+                self._usage_dirty = True
+            if force or self._usage_dirty:
+                self._save_usage()
+    
+    def _schedule_usage_flush(self):
+        """Start the daemon timer for the next background usage write."""
+        self._usage_timer = threading.Timer(self.USAGE_FLUSH_INTERVAL_SECONDS, self._usage_flush_tick)
+        self._usage_timer.daemon = True
+        self._usage_timer.start()
+    
+    def _usage_flush_tick(self):
+        """Timer callback: write pending usage, then schedule the next write."""
+        try:
+            self._flush_usage()
+        except Exception as e:
+            logger.error(f"Failed to save API usage: {e}")
+        if self._usage_timer is not None:
+            self._schedule_usage_flush()
     
     def get_usage_summary(self) -> Dict[str, Any]:
         """Get current API usage summary."""
-        self._load_usage()  # Refresh data
         return {
             "searches_today": self.usage_data.get("searches", 0),
             "limit": self.DAILY_SEARCH_LIMIT,
@@ -133,13 +261,10 @@ class EnhancedImageSearcher:
         try:
             domain = urlparse(url).netloc.lower()
             
-            # Watermarked domains get lowest score
-            if any(wd in domain for wd in self.WATERMARKED_DOMAINS):
-                return -100
-            
-            # Trusted domains get highest score
-            if any(td in domain for td in self.TRUSTED_DOMAINS):
-                return 100
+            # Watermarked and trusted domains get the lowest / highest score
+            score = self._score_netloc(domain)
+            if score:
+                return score
             
             # Check failure history
             with self.failed_domains_lock:
@@ -153,9 +278,25 @@ class EnhancedImageSearcher:
         except:
             return 0
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _score_netloc(domain: str) -> int:
+        """Score a lowercased hostname by the fixed domain lists (-100 watermarked, 100 trusted, 0 neither)."""
+        host = domain.partition(':')[0]
+        if EnhancedImageSearcher._host_in(host, EnhancedImageSearcher._WATERMARKED_HOSTS):
+            return -100
+        if EnhancedImageSearcher._host_in(host, EnhancedImageSearcher._TRUSTED_HOSTS):
+            return 100
+        return 0
+    
+    @staticmethod
+    def _host_in(host: str, domains: frozenset) -> bool:
+        """Check if host is one of the domains or a subdomain of one (not just a substring match)."""
+        parts = host.split('.')
+        return any('.'.join(parts[i:]) in domains for i in range(len(parts) - 1))
+    
     def _check_usage_limit(self) -> Tuple[bool, int]:
         """Check if we're within daily usage limit."""
-        self._load_usage()
         searches_today = self.usage_data.get("searches", 0)
         remaining = self.DAILY_SEARCH_LIMIT - searches_today
         return searches_today < self.DAILY_SEARCH_LIMIT, remaining
@@ -190,12 +331,13 @@ class EnhancedImageSearcher:
         }
         
         try:
-            response = requests.get(self.SEARCH_API_URL, params=params, timeout=10)
+            response = self.session.get(self.SEARCH_API_URL, params=params, timeout=10)
             response.raise_for_status()
             
             # Update usage
-            self.usage_data["searches"] += 1
-            self._save_usage()
+            with self.usage_lock:
+                self.usage_data["searches"] += 1
+                self._usage_dirty = True
             
             data = response.json()
             items = data.get("items", [])
@@ -255,99 +397,120 @@ class EnhancedImageSearcher:
             domain = urlparse(url).netloc
             
             # Skip known problematic domains
-            if any(wd in domain for wd in self.WATERMARKED_DOMAINS):
+            if self._host_in(domain.lower().partition(':')[0], self._WATERMARKED_HOSTS):
                 return {"success": False, "error": "Watermarked domain"}
             
-            # Check if already downloaded (by hash)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            # Try HEAD request first to check size
-            try:
-                head_response = requests.head(url, headers=headers, timeout=5, allow_redirects=True)
-                if head_response.status_code == 200:
-                    content_length = head_response.headers.get('content-length')
-                    if content_length:
-                        size_mb = int(content_length) / (1024 * 1024)
-                        if size_mb > max_size_mb:
-                            self._track_failed_domain(domain)
-                            return {"success": False, "error": f"Image too large: {size_mb:.1f}MB"}
-            except:
-                # If HEAD fails, continue with GET
-                pass
-            
-            # Download image with shorter timeout and retries
-            max_retries = 2
-            for attempt in range(max_retries):
+            # Network part runs under the host's slot so one CDN isn't flooded
+            with self._host_slot(domain):
+                # Download image (connection errors and 5xx responses are retried by the session).
+                # An open-ended Range asks servers that support it to report the full size in
+                # Content-Range before the body, so no separate HEAD round trip is needed.
                 try:
-                    response = requests.get(url, headers=headers, timeout=15, stream=True)
-                    response.raise_for_status()
-                    break
+                    response = self.session.get(url, headers={'Range': 'bytes=0-'}, timeout=(5, 15), stream=True)
                 except requests.Timeout:
-                    if attempt == max_retries - 1:
+                    self._track_failed_domain(domain)
+                    return {"success": False, "error": "Download timeout"}
+                
+                # Closing the response returns its connection to the pool on every exit
+                with response:
+                    response.raise_for_status()
+                    
+                    # Reject oversized images before reading the body
+                    declared_size = self._declared_size(response)
+                    if declared_size > max_size_mb * 1024 * 1024:
                         self._track_failed_domain(domain)
-                        return {"success": False, "error": "Download timeout"}
-                    continue
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise
-            
-            # Check if it's actually an image
-            content_type = response.headers.get('content-type', '')
-            if not content_type.startswith('image/'):
-                self._track_failed_domain(domain)
-                return {"success": False, "error": f"Not an image: {content_type}"}
-            
-            # Load into memory for validation
-            image_data = io.BytesIO()
-            downloaded_size = 0
-            
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    downloaded_size += len(chunk)
-                    if downloaded_size > max_size_mb * 1024 * 1024:
+                        return {"success": False, "error": f"Image too large: {declared_size / (1024 * 1024):.1f}MB"}
+                    
+                    # Check if it's actually an image
+                    content_type = response.headers.get('content-type', '')
+                    if not content_type.startswith('image/'):
                         self._track_failed_domain(domain)
-                        return {"success": False, "error": "Download exceeded size limit"}
-                    image_data.write(chunk)
+                        return {"success": False, "error": f"Not an image: {content_type}"}
+                    
+                    # Load into memory for validation, hashing as the bytes arrive
+                    image_data = io.BytesIO()
+                    hasher = hashlib.md5()
+                    downloaded_size = 0
+                    
+                    for chunk in response.iter_content(chunk_size=8192):
+                        if chunk:
+                            downloaded_size += len(chunk)
+                            if downloaded_size > max_size_mb * 1024 * 1024:
+                                self._track_failed_domain(domain)
+                                return {"success": False, "error": "Download exceeded size limit"}
+                            image_data.write(chunk)
+                            hasher.update(chunk)
             
             image_data.seek(0)
             
+            # Exact duplicates are known as soon as the download ends (the digest was
+            # computed while streaming), so skip them before decoding anything
+            image_hash = hasher.hexdigest()
+            with self.hashes_lock:
+                if image_hash in self.image_hashes:
+                    return {"success": False, "error": "Duplicate image"}
+            
             # Validate it's a real image
             try:
                 img = Image.open(image_data)
-                img.verify()  # Verify it's not corrupted
                 
-                # Re-open for getting info
-                image_data.seek(0)
-                img = Image.open(image_data)
-                
-                # Get image properties
+                # Get image properties (read from the header, nothing is decoded yet)
                 width, height = img.size
                 img_format = img.format
                 
-                # Calculate hash for deduplication
-                image_data.seek(0)
-                image_hash = hashlib.md5(image_data.read()).hexdigest()
+                if img_format == 'JPEG':
+                    # verify() does not check JPEGs; a truncated stream fails in the
+                    # decode below ("image file is truncated") instead.
+                    # Decode at the smallest DCT scale that still covers the thumbnail;
+                    # the hash and the thumbnail share this one decode
+                    img.draft('RGB', (320, 180))
+                else:
+                    img.verify()  # Verify it's not corrupted
+                    
+                    # Re-open for decoding
+                    image_data.seek(0)
+                    img = Image.open(image_data)
                 
-                # Check for duplicates
-                with self.hashes_lock:
-                    if image_hash in self.image_hashes:
-                        return {"success": False, "error": "Duplicate image"}
-                    self.image_hashes.add(image_hash)
+                # Perceptual hash only for new content; it also matches re-encoded
+                # or resized copies
+                phash = perceptual_hash(img)
                 
-                # Save image
-                image_data.seek(0)
-                with open(save_path, 'wb') as f:
-                    f.write(image_data.read())
+                # Check for near-duplicates before spending work on the thumbnail
+                with self.hashes_lock:
+                    if self.phash_index.contains_within(phash, self.PHASH_DUPLICATE_DISTANCE):
+                        return {"success": False, "error": "Near-duplicate image"}
                 
-                # Create thumbnail
                 thumb_dir = os.path.join(os.path.dirname(save_path), 'thumbnails')
                 os.makedirs(thumb_dir, exist_ok=True)
                 thumb_path = os.path.join(thumb_dir, os.path.basename(save_path))
                 
-                img.thumbnail((320, 180), Image.Resampling.LANCZOS)
-                img.save(thumb_path, quality=85)
+                try:
+                    # Create thumbnail. Integer box-reduce close to the target first,
+                    # so LANCZOS only filters a small image
+                    factor = min(img.width // 320, img.height // 180)
+                    thumb = img.reduce(factor) if factor >= 2 and img.mode in self._REDUCIBLE_MODES else img
+                    thumb.thumbnail((320, 180), Image.Resampling.LANCZOS)
+                    thumb.save(thumb_path, quality=85, optimize=False, progressive=False)
+                    
+                    # Save image straight from the download buffer
+                    with open(save_path, 'wb') as f:
+                        f.write(image_data.getbuffer())
+                except Exception:
+                    # No half-saved image may count as a download on the next run
+                    self._remove_files(thumb_path, save_path)
+                    raise
+                
+                # Register the hashes only once both files are on disk; a concurrent
+                # worker may have saved a copy of the same picture in the meantime
+                with self.hashes_lock:
+                    duplicate = (image_hash in self.image_hashes
+                                 or self.phash_index.contains_within(phash, self.PHASH_DUPLICATE_DISTANCE))
+                    if not duplicate:
+                        self.image_hashes.add(image_hash)
+                        self.phash_index.add(phash)
+                if duplicate:
+                    self._remove_files(thumb_path, save_path)
+                    return {"success": False, "error": "Duplicate image"}
                 
                 return {
                     "success": True,
@@ -356,7 +519,8 @@ class EnhancedImageSearcher:
                     "aspect_ratio": round(width / height, 2),
                     "size_mb": round(downloaded_size / (1024 * 1024), 2),
                     "format": img_format,
-                    "hash": image_hash
+                    "hash": image_hash,
+                    "phash": f"{phash:016x}"
                 }
                 
             except Exception as e:
@@ -367,6 +531,33 @@ class EnhancedImageSearcher:
             self._track_failed_domain(domain)
             return {"success": False, "error": str(e)}
     
+    @staticmethod
+    def _remove_files(*paths: str) -> None:
+        """Delete files written for a rejected image, ignoring ones that don't exist."""
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    @staticmethod
+    def _declared_size(response: requests.Response) -> int:
+        """
+        Full size of the resource as declared by the server (0 if unknown).
+        
+        Args:
+            response: Streamed image response
+            
+        Returns:
+            Size in bytes from Content-Range ("bytes 0-N/total") or Content-Length
+        """
+        content_range = response.headers.get('content-range', '')
+        total = content_range.rpartition('/')[2]
+        if total.isdigit():
+            return int(total)
+        content_length = response.headers.get('content-length', '')
+        return int(content_length) if content_length.isdigit() else 0
+    
     def download_images_for_shot_smart(self, shot_num: int, search_query: str, 
                                      images_dir: str) -> Dict[str, Any]:
         """
@@ -393,17 +584,24 @@ class EnhancedImageSearcher:
         
         start_index = 1
         max_searches = 5  # Maximum API calls per shot
+        letter_index = 1  # Next image letter, starting at B (A reserved for AI)
+        next_page: Optional[concurrent.futures.Future] = None  # Prefetched search for start_index
         
         while shot_result["successful_downloads"] < self.MIN_IMAGES_PER_SHOT and shot_result["api_calls"] < max_searches:
-            # Check API limit before each search
-            within_limit, remaining = self._check_usage_limit()
-            if not within_limit:
-                logger.warning(f"API limit reached while processing shot {shot_num}")
-                break
+            # Check API limit before each search (a prefetched page was checked when queued)
+            if next_page is None:
+                within_limit, remaining = self._check_usage_limit()
+                if not within_limit:
+                    logger.warning(f"API limit reached while processing shot {shot_num}")
+                    break
             
             # Search for images
             try:
-                search_results = self.search_images(search_query, num_results=10, start_index=start_index)
+                if next_page is not None:
+                    search_results = next_page.result()
+                    next_page = None
+                else:
+                    search_results = self.search_images(search_query, num_results=10, start_index=start_index)
                 shot_result["api_calls"] += 1
                 shot_result["total_results"] += len(search_results)
                 
@@ -411,88 +609,104 @@ class EnhancedImageSearcher:
                     logger.warning(f"No more results for shot {shot_num}")
                     break
                 
-                # Download images from this batch
-                with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                    futures = []
-                    letter_index = shot_result["successful_downloads"] + 1  # Continue from where we left off
+                # Download images from this batch on the shared pool
+                future_map: Dict[concurrent.futures.Future, Tuple[Dict[str, Any], str]] = {}
+                
+                for result in search_results:
+                    # Don't limit downloads on first search - try all 10
+                    # Only stop early on subsequent searches if we've hit our target
+                    if shot_result["api_calls"] > 1 and shot_result["successful_downloads"] >= self.IMAGES_PER_SHOT:
+                        break
                     
-                    for result in search_results:
-                        # Don't limit downloads on first search - try all 10
-                        # Only stop early on subsequent searches if we've hit our target
-                        if shot_result["api_calls"] > 1 and shot_result["successful_downloads"] >= self.IMAGES_PER_SHOT:
-                            break
-                        
-                        url = result.get("link")
-                        if not url:
-                            continue
-                        
-                        # Determine filename
-                        ext = self.get_file_extension(url, result.get("mime"))
-                        letter = chr(65 + letter_index)  # A=65, B=66, etc.
-                        filename = f"{shot_num}{letter}{ext}"
-                        save_path = os.path.join(images_dir, filename)
-                        
-                        # Skip if file already exists
-                        if os.path.exists(save_path):
-                            shot_result["successful_downloads"] += 1
-                            letter_index += 1
-                            continue
-                        
-                        # Submit download task
-                        future = executor.submit(
-                            self.validate_and_download_image,
-                            url, save_path
-                        )
-                        futures.append((future, result, filename, letter_index))
-                        shot_result["download_attempts"] += 1
+                    url = result.get("link")
+                    if not url:
+                        continue
                     
-                    # Process results as they complete
-                    for future, result, filename, idx in futures:
-                        try:
-                            download_result = future.result(timeout=30)
-                            
-                            if download_result["success"]:
-                                shot_result["successful_downloads"] += 1
-                                letter_index = shot_result["successful_downloads"] + 1
-                                image_metadata = {
-                                    "filename": filename,
-                                    "url": result.get("link"),
-                                    "title": result.get("title", ""),
-                                    "snippet": result.get("snippet", ""),
-                                    "source": result.get("displayLink", ""),
-                                    "context_url": result.get("contextLink", ""),
-                                    "width": download_result.get("width"),
-                                    "height": download_result.get("height"),
-                                    "aspect_ratio": download_result.get("aspect_ratio"),
-                                    "size_mb": download_result.get("size_mb"),
-                                    "format": download_result.get("format"),
-                                    "hash": download_result.get("hash"),
-                                    "domain_score": result.get("domain_score", 0)
-                                }
-                                shot_result["images"].append(image_metadata)
-                            else:
-                                shot_result["failed_downloads"] += 1
-                                logger.debug(f"Failed to download {filename}: {download_result.get('error')}")
-                                
-                        except concurrent.futures.TimeoutError:
-                            shot_result["failed_downloads"] += 1
-                            logger.error(f"Download timeout (30s) for {filename} from {result.get('link', 'unknown URL')}")
-                        except Exception as e:
-                            shot_result["failed_downloads"] += 1
-                            error_msg = str(e) if str(e) else repr(e)
-                            logger.error(f"Download error for {filename}: {type(e).__name__}: {error_msg}")
+                    # Out of letters (B-Z) for this shot
+                    if letter_index > 25:
+                        break
+                    
+                    # Determine filename
+                    ext = self.get_file_extension(url, result.get("mime"))
+                    letter = chr(65 + letter_index)  # A=65, B=66, etc.
+                    filename = f"{shot_num}{letter}{ext}"
+                    save_path = os.path.join(images_dir, filename)
+                    
+                    # Skip if file already exists
+                    if os.path.exists(save_path):
+                        shot_result["successful_downloads"] += 1
+                        letter_index += 1
+                        continue
+                    
+                    # Later result pages and other shots often repeat a URL; fetch each once
+                    normalized_url = self._normalize_url(url)
+                    if normalized_url in self.seen_urls:
+                        continue
+                    self.seen_urls.add(normalized_url)
+                    
+                    # Submit download task
+                    future = self._download_pool.submit(
+                        self.validate_and_download_image,
+                        url, save_path
+                    )
+                    future_map[future] = (result, filename)
+                    letter_index += 1
+                    shot_result["download_attempts"] += 1
                 
                 # Update start index for next search
                 start_index += len(search_results)
                 
-                # Small delay between searches
-                if shot_result["successful_downloads"] < self.IMAGES_PER_SHOT:
-                    time.sleep(0.5)
+                # If even a clean sweep of this page leaves the shot short, the next page
+                # is needed anyway: fetch it while this page downloads
+                if (shot_result["successful_downloads"] + len(future_map) < self.MIN_IMAGES_PER_SHOT
+                        and shot_result["api_calls"] < max_searches
+                        and self._check_usage_limit()[0]):
+                    next_page = self._search_pool.submit(
+                        self.search_images, search_query, num_results=10, start_index=start_index
+                    )
+                
+                # Process results as they complete; stalled connections are cut off
+                # by the request timeouts inside the worker
+                for future in concurrent.futures.as_completed(future_map):
+                    result, filename = future_map[future]
+                    try:
+                        download_result = future.result()
+                        
+                        if download_result["success"]:
+                            shot_result["successful_downloads"] += 1
+                            image_metadata = {
+                                "filename": filename,
+                                "url": result.get("link"),
+                                "title": result.get("title", ""),
+                                "snippet": result.get("snippet", ""),
+                                "source": result.get("displayLink", ""),
+                                "context_url": result.get("contextLink", ""),
+                                "width": download_result.get("width"),
+                                "height": download_result.get("height"),
+                                "aspect_ratio": download_result.get("aspect_ratio"),
+                                "size_mb": download_result.get("size_mb"),
+                                "format": download_result.get("format"),
+                                "hash": download_result.get("hash"),
+                                "phash": download_result.get("phash"),
+                                "domain_score": result.get("domain_score", 0)
+                            }
+                            shot_result["images"].append(image_metadata)
+                        else:
+                            shot_result["failed_downloads"] += 1
+                            logger.debug(f"Failed to download {filename}: {download_result.get('error')}")
+                            
+                    except Exception as e:
+                        shot_result["failed_downloads"] += 1
+                        error_msg = str(e) if str(e) else repr(e)
+                        logger.error(f"Download error for {filename}: {type(e).__name__}: {error_msg}")
                     
             except Exception as e:
                 logger.error(f"Search error for shot {shot_num}: {e}")
                 break
         
+        # Downloads finish out of order; list images by letter
+        shot_result["images"].sort(key=lambda image: image["filename"])
+        
         # Log results
         if shot_result['successful_downloads'] >= self.MIN_IMAGES_PER_SHOT:
             logger.info(f"Shot {shot_num}: Downloaded {shot_result['successful_downloads']} images (target: {self.IMAGES_PER_SHOT}, min: {self.MIN_IMAGES_PER_SHOT}) using {shot_result['api_calls']} API call(s)")
@@ -501,27 +715,22 @@ class EnhancedImageSearcher:
         
         return shot_result
     
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """Normalize an image URL for duplicate checks (lowercase host, no fragment)."""
+        parsed = urlparse(url)
+        return parsed._replace(netloc=parsed.netloc.lower(), fragment='').geturl()
+    
     def get_file_extension(self, url: str, mime_type: str = None) -> str:
         """Determine file extension from URL or MIME type."""
         # Try from URL first
-        parsed = urlparse(url)
-        path = parsed.path.lower()
-        
-        for ext in self.SUPPORTED_EXTENSIONS:
-            if path.endswith(ext):
-                return ext
+        match = self._EXTENSION_RE.search(urlparse(url).path)
+        if match:
+            return '.' + match.group(1).lower()
         
         # Try from MIME type
         if mime_type:
-            mime_map = {
-                'image/jpeg': '.jpg',
-                'image/jpg': '.jpg',
-                'image/png': '.png',
-                'image/gif': '.gif',
-                'image/webp': '.webp',
-                'image/bmp': '.bmp'
-            }
-            ext = mime_map.get(mime_type.lower())
+            ext = self._MIME_MAP.get(mime_type.lower())
             if ext:
                 return ext
         
@@ -545,6 +754,10 @@ class EnhancedImageSearcher:
                         for img in shot_data.get("images", []):
                             if img.get("hash"):
                                 self.image_hashes.add(img["hash"])
+                            if img.get("url"):
+                                self.seen_urls.add(self._normalize_url(img["url"]))
+                            if img.get("phash"):
+                                self.phash_index.add(int(img["phash"], 16))
             except:
                 pass
         
@@ -571,6 +784,15 @@ class EnhancedImageSearcher:
             "domain_statistics": {}
         }
         
+        # Count existing images per shot with one directory scan
+        existing_counts: Counter = Counter()
+        if skip_existing and os.path.isdir(images_dir):
+            with os.scandir(images_dir) as it:
+                for entry in it:
+                    match = self._EXISTING_IMAGE_RE.match(entry.name)
+                    if match:
+                        existing_counts[match.group(1)] += 1
+        
         # Process each shot
         for shot in storyboard:
             shot_num = shot.get("shot_number")
@@ -579,11 +801,7 @@ class EnhancedImageSearcher:
             
             # Check if we already have enough images for this shot
             if skip_existing:
-                existing_count = 0
-                if os.path.exists(images_dir):
-                    import glob
-                    existing_files = glob.glob(os.path.join(images_dir, f"{shot_num}[B-Z].*"))
-                    existing_count = len(existing_files)
+                existing_count = existing_counts[str(shot_num)]
                 
                 if existing_count >= self.MIN_IMAGES_PER_SHOT:
                     logger.info(f"Skipping shot {shot_num} - already has {existing_count} images (min: {self.MIN_IMAGES_PER_SHOT})")
@@ -640,6 +858,6 @@ class EnhancedImageSearcher:
             results["domain_statistics"]["failed_domains"] = dict(self.failed_domains)
         
         # Save updated usage
-        self._save_usage()
+        self._flush_usage(force=True)
         
         return results
\ No newline at end of file
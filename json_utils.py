@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+JSON helpers for JGL Assistant.
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    # Same compact separators and raw UTF-8 as orjson, so both backends write identical bytes
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(path: str, obj: Any, indent: bool = True) -> None:
+    """Write obj to path as JSON (indented by default)."""
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, indent=indent))
+
+
+def read_json(path: str) -> Any:
+    """Read and parse a JSON file."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
@@ -6,7 +6,6 @@ Main entry point for the application.
 
 import os
 import sys
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +16,7 @@ from storyboard_generator import StoryboardGenerator
 from music_plan_generator import MusicPlanGenerator
 from folder_manager import ActorFolderManager
 from cost_tracker import CostTracker, format_cost_summary
+from json_utils import read_json, write_json
 from step3_image_search import proceed_to_step3
 
 # Load environment variables
@@ -158,8 +158,7 @@ def check_existing_storyboard(folder_manager, actor_name):
         
         # Load and show basic info
         try:
-            with open(existing_storyboard, 'r') as f:
-                sb_data = json.load(f)
+            sb_data = read_json(existing_storyboard)
             shot_count = sb_data.get('shot_count', len(sb_data.get('storyboard', [])))
             
             print(f"\n📋 Found existing storyboard for {actor_name}")
@@ -212,8 +211,7 @@ def check_existing_music_plan(folder_manager, actor_name):
         
         # Load and show basic info
         try:
-            with open(existing_music_plan, 'r') as f:
-                mp_data = json.load(f)
+            mp_data = read_json(existing_music_plan)
             prompt_count = len(mp_data.get('music_prompts', []))
             
             print(f"\n🎵 Found existing music plan for {actor_name}")
@@ -307,8 +305,7 @@ def proceed_to_step2(storyboard_generator, music_plan_generator, folder_manager,
                     }
                 }
             
-                with open(storyboard_path, 'w', encoding='utf-8') as f:
-                    json.dump(storyboard_data, f, indent=2)
+                write_json(storyboard_path, storyboard_data)
                 print(f"  Saved to: {storyboard_path}")
             
                 # Show cost analysis
@@ -389,8 +386,7 @@ def proceed_to_step2(storyboard_generator, music_plan_generator, folder_manager,
                     }
                 }
                     
-                with open(music_plan_path, 'w', encoding='utf-8') as f:
-                    json.dump(music_plan_data, f, indent=2)
+                write_json(music_plan_path, music_plan_data)
                 print(f"  Saved to: {music_plan_path}")
                     
                 # Show cost analysis
@@ -429,6 +425,7 @@ def proceed_to_step2(storyboard_generator, music_plan_generator, folder_manager,
         
         # Show final cost summary if tracker available
         if cost_tracker:
+            cost_tracker.flush()
             print("\n📊 Final Cost Tracking Summary:")
             summary = format_cost_summary(cost_tracker)
             for line in summary.split('\n'):
@@ -537,8 +534,7 @@ def main():
                     print(f"  Saved to: {txt_path}")
                     
                     # Save JSON to actor folder
-                    with open(paths['json'], 'w', encoding='utf-8') as f:
-                        json.dump(result, f, indent=2)
+                    write_json(paths['json'], result)
                     print(f"  JSON backup: {paths['json']}")
                     
                 except Exception as e:
@@ -627,6 +623,7 @@ def main():
                 proceed_to_step2(storyboard_generator, music_plan_generator, folder_manager, actor_name, paths['script'], cost_tracker)
                 
                 # Show cost summary
+                cost_tracker.flush()
                 print("\n📊 Cost Tracking Summary:")
                 summary = format_cost_summary(cost_tracker)
                 for line in summary.split('\n'):
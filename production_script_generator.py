@@ -1,6 +1,7 @@
 import os
 import json
 import time
+import asyncio
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
@@ -106,11 +107,15 @@ REMINDER CHECKLIST (self-verify before output)
 ☐ «???» inserted wherever factual certainty < 90 %  
 ☐ Only spoken narration appears in final output"""
     
+    # Template split around the name once, so building a prompt is a single join
+    _PROMPT_FRAGMENTS = SCRIPT_PROMPT_TEMPLATE.split("{actor_name}")
+    
     # Configuration
     DEFAULT_MODEL = "o3-2025-04-16"
     FALLBACK_MODEL = "o3-mini-2025-01-31"
     MAX_RETRIES = 3
     RETRY_DELAY = 2  # seconds
+    MAX_CONCURRENCY = 4  # concurrent requests in batch_generate
     OUTPUT_DIR = "dev/llm"
     
     # Validation rules
@@ -270,32 +275,90 @@ REMINDER CHECKLIST (self-verify before output)
             Dictionary with script data and metadata
         """
         max_retries = max_retries or self.MAX_RETRIES
-        last_error = None
+        result: Dict[str, Any] = {}
         
         for attempt in range(max_retries):
-            try:
-                logger.info(f"Attempt {attempt + 1}/{max_retries} for {actor_name}")
-                result = self.generate_script(actor_name)
-                
-                # If successful, return (even if validation had warnings)
-                if result.get("success"):
-                    if not result.get("valid"):
-                        logger.info(f"Script generated with validation notes: {result.get('validation_issues')}")
-                    return result
-                    
-            except Exception as e:
-                last_error = e
-                logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
-                
-                if attempt < max_retries - 1:
-                    wait_time = self.RETRY_DELAY * (attempt + 1)
-                    logger.info(f"Waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
+            logger.info(f"Attempt {attempt + 1}/{max_retries} for {actor_name}")
+            result = self.generate_script(actor_name)
+            
+            wait_time = self._retry_delay(result, attempt, max_retries)
+            if wait_time is None:
+                return result
+            time.sleep(wait_time)
+        
+        return self._build_retry_failure(actor_name, result, max_retries)
+    
+    async def generate_script_with_retry_async(self, actor_name: str, max_retries: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Async counterpart of generate_script_with_retry, used for concurrent batches.
         
-        # All retries failed
+        Args:
+            actor_name: Name of the actor
+            max_retries: Override default max retries
+            
+        Returns:
+            Dictionary with script data and metadata
+        """
+        max_retries = max_retries or self.MAX_RETRIES
+        result: Dict[str, Any] = {}
+        
+        for attempt in range(max_retries):
+            logger.info(f"Attempt {attempt + 1}/{max_retries} for {actor_name}")
+            result = await self.generate_script_async(actor_name)
+            
+            wait_time = self._retry_delay(result, attempt, max_retries)
+            if wait_time is None:
+                return result
+            await asyncio.sleep(wait_time)
+        
+        return self._build_retry_failure(actor_name, result, max_retries)
+    
+    def _retry_delay(self, result: Dict[str, Any], attempt: int, max_retries: int) -> Optional[float]:
+        """
+        Decide what to do after one generation attempt.
+        
+        Args:
+            result: The attempt's result dictionary
+            attempt: Zero-based attempt number
+            max_retries: Total attempts allowed
+            
+        Returns:
+            None to stop and return the result, otherwise seconds to wait before the next attempt
+        """
+        # If successful, return (even if validation had warnings)
+        if result.get("success"):
+            if not result.get("valid"):
+                logger.info(f"Script generated with validation notes: {result.get('validation_issues')}")
+            return None
+        
+        logger.error(f"Attempt {attempt + 1} failed: {result.get('error')}")
+        
+        # A rejected actor name fails the same way every time
+        if result.get("error_type") == "validation":
+            return None
+        
+        # Out of attempts: no point waiting, the caller's loop ends here
+        if attempt >= max_retries - 1:
+            return 0.0
+        wait_time = self.RETRY_DELAY * (attempt + 1)
+        logger.info(f"Waiting {wait_time} seconds before retry...")
+        return wait_time
+    
+    def _build_retry_failure(self, actor_name: str, last_result: Dict[str, Any], max_retries: int) -> Dict[str, Any]:
+        """
+        Build the result returned once every attempt has failed.
+        
+        Args:
+            actor_name: Name of the actor
+            last_result: Result of the final attempt
+            max_retries: Number of attempts made
+            
+        Returns:
+            Dictionary describing the failure
+        """
         error_msg = f"Failed after {max_retries} attempts"
-        if last_error:
-            error_msg += f": {str(last_error)}"
+        if last_result.get("error"):
+            error_msg += f": {last_result['error']}"
         
         return {
             "actor_name": actor_name,
@@ -322,104 +385,158 @@ REMINDER CHECKLIST (self-verify before output)
             logger.info(f"Generating script for: {actor_name}")
             
             # Format prompt
-            prompt = self.SCRIPT_PROMPT_TEMPLATE.format(actor_name=actor_name)
+            prompt = actor_name.join(self._PROMPT_FRAGMENTS)
             
             # Generate script
             result = Runner.run_sync(self.agent, prompt)
-            output = result.final_output
-            
-            # Extract token usage from result if available
-            usage_data = {}
-            if hasattr(result, 'context_wrapper') and result.context_wrapper and hasattr(result.context_wrapper, 'usage'):
-                usage = result.context_wrapper.usage
-                usage_data = {
-                    'input_tokens': getattr(usage, 'input_tokens', None),
-                    'output_tokens': getattr(usage, 'output_tokens', None),
-                    'total_tokens': getattr(usage, 'total_tokens', None)
-                }
-                
-                # Check for reasoning tokens in output details
-                if hasattr(usage, 'output_tokens_details') and usage.output_tokens_details:
-                    usage_data['reasoning_tokens'] = getattr(usage.output_tokens_details, 'reasoning_tokens', 0)
-                else:
-                    usage_data['reasoning_tokens'] = 0
-            
-            # Parse sections
-            sections = self._parse_script_sections(output)
-            
-            # Validate output (now only checks for HOOK/BIO)
-            is_valid, validation_issues = self._validate_script_output(output, actor_name)
-            
-            # Log validation info if any
-            if validation_issues:
-                logger.info(f"Validation notes for {actor_name}: {validation_issues}")
-            
-            # Calculate metrics
-            word_count = len(output.split())
-            generation_time = time.time() - start_time
-            
-            # Prepare response
-            script_data = {
-                "actor_name": actor_name,
-                "full_script": output,
-                "sections": sections,
-                "word_count": word_count,
-                "model_used": self.model_name,
-                "generation_time": round(generation_time, 2),
-                "timestamp": datetime.now().isoformat(),
-                "success": True,
-                "valid": is_valid,
-                "validation_issues": validation_issues if not is_valid else None,
-                "usage": usage_data if usage_data else None,
-                "reasoning_effort": "high"
-            }
+            return self._build_script_data(actor_name, result, start_time)
             
-            # Add individual sections if parsed
-            if "hook" in sections:
-                script_data["hook"] = sections["hook"]
-            if "bio" in sections:
-                script_data["bio"] = sections["bio"]
+        except Exception as e:
+            return self._build_error_data(actor_name, e)
+    
+    async def generate_script_async(self, actor_name: str) -> Dict[str, Any]:
+        """
+        Generate a biography script without blocking the event loop.
+        
+        Args:
+            actor_name: Name of the actor
             
-            # Log success
-            logger.info(f"Successfully generated script for {actor_name} "
-                       f"({word_count} words in {generation_time:.1f}s)")
+        Returns:
+            Dictionary containing script data and metadata
+        """
+        start_time = time.time()
+        
+        try:
+            # Validate input
+            actor_name = self.validate_actor_name(actor_name)
+            logger.info(f"Generating script for: {actor_name}")
             
-            return script_data
+            # Format prompt
+            prompt = actor_name.join(self._PROMPT_FRAGMENTS)
             
-        except ValidationError as e:
-            logger.error(f"Validation error: {e}")
-            return {
-                "actor_name": actor_name,
-                "error": f"Validation error: {str(e)}",
-                "error_type": "validation",
-                "success": False,
-                "timestamp": datetime.now().isoformat()
-            }
+            # Generate script
+            result = await Runner.run(self.agent, prompt)
+            return self._build_script_data(actor_name, result, start_time)
             
         except Exception as e:
-            logger.error(f"Generation error: {e}", exc_info=True)
+            return self._build_error_data(actor_name, e)
+    
+    def _build_script_data(self, actor_name: str, result: Any, start_time: float) -> Dict[str, Any]:
+        """
+        Turn a finished agent run into the script data dictionary.
+        
+        Args:
+            actor_name: The validated actor name
+            result: The agent run result
+            start_time: When generation started (time.time())
             
-            # Check for specific API errors
-            error_str = str(e)
-            error_type = "unknown"
+        Returns:
+            Dictionary containing script data and metadata
+        """
+        output = result.final_output
+        
+        # Extract token usage from result if available
+        usage_data = {}
+        if hasattr(result, 'context_wrapper') and result.context_wrapper and hasattr(result.context_wrapper, 'usage'):
+            usage = result.context_wrapper.usage
+            usage_data = {
+                'input_tokens': getattr(usage, 'input_tokens', None),
+                'output_tokens': getattr(usage, 'output_tokens', None),
+                'total_tokens': getattr(usage, 'total_tokens', None)
+            }
             
-            if "rate_limit" in error_str.lower():
-                error_type = "rate_limit"
-            elif "api_key" in error_str.lower():
-                error_type = "authentication"
-            elif "model_not_found" in error_str.lower():
-                error_type = "model_access"
-            elif "timeout" in error_str.lower():
-                error_type = "timeout"
+            # Check for reasoning tokens in output details
+            if hasattr(usage, 'output_tokens_details') and usage.output_tokens_details:
+                usage_data['reasoning_tokens'] = getattr(usage.output_tokens_details, 'reasoning_tokens', 0)
+            else:
+                usage_data['reasoning_tokens'] = 0
+        
+        # Parse sections
+        sections = self._parse_script_sections(output)
+        
+        # Validate output (now only checks for HOOK/BIO)
+        is_valid, validation_issues = self._validate_script_output(output, actor_name)
+        
+        # Log validation info if any
+        if validation_issues:
+            logger.info(f"Validation notes for {actor_name}: {validation_issues}")
+        
+        # Calculate metrics
+        word_count = len(output.split())
+        generation_time = time.time() - start_time
+        
+        # Prepare response
+        script_data = {
+            "actor_name": actor_name,
+            "full_script": output,
+            "sections": sections,
+            "word_count": word_count,
+            "model_used": self.model_name,
+            "generation_time": round(generation_time, 2),
+            "timestamp": datetime.now().isoformat(),
+            "success": True,
+            "valid": is_valid,
+            "validation_issues": validation_issues if not is_valid else None,
+            "usage": usage_data if usage_data else None,
+            "reasoning_effort": "high"
+        }
+        
+        # Add individual sections if parsed
+        if "hook" in sections:
+            script_data["hook"] = sections["hook"]
+        if "bio" in sections:
+            script_data["bio"] = sections["bio"]
+        
+        # Log success
+        logger.info(f"Successfully generated script for {actor_name} "
+                   f"({word_count} words in {generation_time:.1f}s)")
+        
+        return script_data
+    
+    def _build_error_data(self, actor_name: str, error: Exception) -> Dict[str, Any]:
+        """
+        Build the failure dictionary for a generation error.
+        
+        Args:
+            actor_name: The actor name as passed in
+            error: The exception raised during generation
             
+        Returns:
+            Dictionary describing the error
+        """
+        if isinstance(error, ValidationError):
+            logger.error(f"Validation error: {error}")
             return {
                 "actor_name": actor_name,
-                "error": str(e),
-                "error_type": error_type,
+                "error": f"Validation error: {str(error)}",
+                "error_type": "validation",
                 "success": False,
-                "model_used": self.model_name,
                 "timestamp": datetime.now().isoformat()
             }
+        
+        logger.error(f"Generation error: {error}", exc_info=error)
+        
+        # Check for specific API errors
+        error_str = str(error)
+        error_type = "unknown"
+        
+        if "rate_limit" in error_str.lower():
+            error_type = "rate_limit"
+        elif "api_key" in error_str.lower():
+            error_type = "authentication"
+        elif "model_not_found" in error_str.lower():
+            error_type = "model_access"
+        elif "timeout" in error_str.lower():
+            error_type = "timeout"
+        
+        return {
+            "actor_name": actor_name,
+            "error": str(error),
+            "error_type": error_type,
+            "success": False,
+            "model_used": self.model_name,
+            "timestamp": datetime.now().isoformat()
+        }
     
     def save_script(self, script_data: Dict[str, Any], filename: Optional[str] = None) -> str:
         """
@@ -456,6 +573,9 @@ REMINDER CHECKLIST (self-verify before output)
         """
         Generate scripts for multiple actors with progress tracking.
         
+        Requests run concurrently (up to MAX_CONCURRENCY at once); results
+        are saved and costed afterwards in input order.
+        
         Args:
             actor_names: List of actor names
             save_results: Whether to save individual results
@@ -465,18 +585,12 @@ REMINDER CHECKLIST (self-verify before output)
         """
         logger.info(f"Starting batch generation for {len(actor_names)} actors")
         
-        results = []
+        results = asyncio.run(self._generate_batch(actor_names))
         successful = 0
         failed = 0
         total_cost = 0
         
-        for i, actor_name in enumerate(actor_names, 1):
-            logger.info(f"Processing {i}/{len(actor_names)}: {actor_name}")
-            
-            # Generate with retry
-            result = self.generate_script_with_retry(actor_name)
-            results.append(result)
-            
+        for actor_name, result in zip(actor_names, results):
             if result.get("success"):
                 successful += 1
                 
@@ -491,10 +605,6 @@ REMINDER CHECKLIST (self-verify before output)
                 total_cost += self.estimate_cost(result)["total_cost"]
             else:
                 failed += 1
-            
-            # Rate limiting pause
-            if i < len(actor_names):
-                time.sleep(1)
         
         # Summary
         summary = {
@@ -516,6 +626,20 @@ REMINDER CHECKLIST (self-verify before output)
         
         return summary
     
+    async def _generate_batch(self, actor_names: List[str]) -> List[Dict[str, Any]]:
+        """Run generation for all actors concurrently, bounded by MAX_CONCURRENCY."""
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        total = len(actor_names)
+        
+        async def generate_one(i: int, actor_name: str) -> Dict[str, Any]:
+            async with semaphore:
+                logger.info(f"Processing {i}/{total}: {actor_name}")
+                return await self.generate_script_with_retry_async(actor_name)
+        
+        return await asyncio.gather(
+            *(generate_one(i, actor_name) for i, actor_name in enumerate(actor_names, 1))
+        )
+    
     def estimate_cost(self, script_data: Dict[str, Any]) -> Dict[str, float]:
         """
         Estimate the API cost for the script generation.